@@ -2,7 +2,18 @@
 
 from __future__ import annotations
 
-from typing import Any, Optional
+import ast
+import bisect
+import hashlib
+import operator as _op
+import re
+import struct
+import threading
+import tokenize
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
 class AnyType(str):
@@ -54,11 +65,665 @@ def _to_number(x: Any) -> float:
     )
 
 
+def _try_number(x: Any) -> Optional[float]:
+    try:
+        return _to_number(x)
+    except TypeError:
+        return None
+
+
+def _ordering(fn: Callable[[Any, Any], bool], symbol: str) -> Callable[[Any, Any], bool]:
+    """Numeric ordering when both sides are numeric-like, else lexicographic for two strings."""
+
+    def compare(a: Any, b: Any) -> bool:
+        a_num, b_num = _try_number(a), _try_number(b)
+        if a_num is not None and b_num is not None:
+            return fn(a_num, b_num)
+        if isinstance(a, str) and isinstance(b, str):
+            return fn(a, b)
+        raise TypeError(f"Operator {symbol!r} requires numeric or string inputs for ordering.")
+
+    return compare
+
+
+# ---- membership: in / not in / between ----
+# A value list (text or list input) is compiled once into a frozenset of members plus merged,
+# sorted ranges searched with bisect, and cached by content so later runs only do the lookup.
+
+_VALUE_SPLIT = re.compile(r"[,;\r\n]+")
+_RANGE = re.compile(r"^(.+?)\s*\.\.\s*(.+)$")
+_VALUE_SETS_MAX = 32
+
+
+def _parse_scalar(tok: str) -> Any:
+    """Integer text stays exact (large seeds), then float, then the stripped string."""
+    tok = tok.strip().strip("\"'")
+    try:
+        return int(tok)
+    except ValueError:
+        pass
+    try:
+        return float(tok)
+    except ValueError:
+        return tok
+
+
+def _lookup_key(x: Any) -> Any:
+    x = _unwrap_singleton(x)
+    if isinstance(x, str):
+        return _parse_scalar(x)
+    if hasattr(x, "item") and getattr(x, "ndim", 0) == 0:
+        return x.item()
+    return x
+
+
+class _ValueSet:
+    """Compiled allow/deny list: O(1) member lookup, O(log n) range lookup."""
+
+    __slots__ = ("members", "starts", "ends", "_device_cache")
+
+    def __init__(self, items: List[Any], ranges: List[Tuple[float, float]]):
+        self.members = frozenset(items)
+        merged: List[List[float]] = []
+        for lo, hi in sorted((min(r), max(r)) for r in ranges):
+            if merged and lo <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], hi)
+            else:
+                merged.append([lo, hi])
+        self.starts = [r[0] for r in merged]
+        self.ends = [r[1] for r in merged]
+        self._device_cache: Dict[Any, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.members) + len(self.starts)
+
+    def describe(self) -> str:
+        return f"<{len(self.members)} values, {len(self.starts)} ranges>"
+
+    def contains(self, x: Any) -> bool:
+        x = _lookup_key(x)
+        try:
+            if x in self.members:
+                return True
+        except TypeError:  # unhashable
+            return False
+        if self.starts and isinstance(x, (int, float)) and not isinstance(x, bool):
+            i = bisect.bisect_right(self.starts, x) - 1
+            return i >= 0 and x <= self.ends[i]
+        return False
+
+    def arrays(self, like: Any, kind: str) -> Tuple[Any, Any, Any]:
+        """(members, starts, ends) as arrays next to `like`; built once per device."""
+        device = getattr(like, "device", None) if kind == "torch" else None
+        key = (kind, str(device))
+        hit = self._device_cache.get(key)
+        if hit is None:
+            numeric = [v for v in self.members if isinstance(v, (int, float)) and not isinstance(v, bool)]
+            if kind == "torch":
+                import torch
+
+                real = torch.float32 if device is not None and device.type == "mps" else torch.float64
+                dtype = real if any(isinstance(v, float) for v in numeric) else torch.int64
+                hit = (
+                    torch.tensor(numeric, dtype=dtype, device=device),
+                    torch.tensor(self.starts, dtype=real, device=device),
+                    torch.tensor(self.ends, dtype=real, device=device),
+                )
+            else:
+                import numpy
+
+                hit = tuple(numpy.asarray(v) for v in (numeric, self.starts, self.ends))
+            self._device_cache[key] = hit
+        return hit
+
+
+def _compile_values(source: Any) -> _ValueSet:
+    items: List[Any] = []
+    ranges: List[Tuple[float, float]] = []
+    if isinstance(source, str):
+        for tok in _VALUE_SPLIT.split(source):
+            tok = tok.strip()
+            if not tok:
+                continue
+            m = _RANGE.match(tok)
+            lo, hi = (_parse_scalar(m.group(1)), _parse_scalar(m.group(2))) if m else (None, None)
+            if m and isinstance(lo, (int, float)) and isinstance(hi, (int, float)):
+                ranges.append((lo, hi))
+            else:
+                items.append(_parse_scalar(tok))
+    else:
+        for v in source:
+            if isinstance(v, (list, tuple)) and len(v) == 2 and all(isinstance(x, (int, float)) for x in v):
+                ranges.append((v[0], v[1]))
+            else:
+                items.append(_lookup_key(v))
+    return _ValueSet(items, ranges)
+
+
+_VALUE_SETS: "OrderedDict[Any, _ValueSet]" = OrderedDict()
+_VALUE_SETS_LOCK = threading.Lock()
+
+
+def _value_set(source: Any) -> _ValueSet:
+    """Compiled value list for text, list/tuple/set or array input, cached by content."""
+    if isinstance(source, _ValueSet):
+        return source
+    if _array_kind(source) is not None:
+        source = source.reshape(-1).tolist()
+    elif isinstance(source, (set, frozenset)):
+        source = sorted(source, key=repr)
+    elif not isinstance(source, (str, list, tuple)):
+        source = [source]
+    try:
+        key = source if isinstance(source, str) else ("items", tuple(
+            tuple(v) if isinstance(v, list) else v for v in source))
+        hash(key)
+    except TypeError:
+        key = ("repr", repr(source))
+
+    with _VALUE_SETS_LOCK:
+        hit = _VALUE_SETS.get(key)
+        if hit is not None:
+            _VALUE_SETS.move_to_end(key)
+            return hit
+    compiled = _compile_values(source)
+    with _VALUE_SETS_LOCK:
+        _VALUE_SETS[key] = compiled
+        while len(_VALUE_SETS) > _VALUE_SETS_MAX:
+            _VALUE_SETS.popitem(last=False)
+    return compiled
+
+
+def _between(a: Any, bounds: Any) -> bool:
+    bounds = _value_set(bounds)
+    lo_hi = sorted(bounds.members, key=repr) if not bounds.starts else None
+    if lo_hi is not None:
+        if len(lo_hi) not in (1, 2):
+            raise ValueError("between needs exactly two bounds (lo, hi) or lo..hi ranges")
+        lo, hi = min(lo_hi, key=_to_number), max(lo_hi, key=_to_number)
+        return _SCALAR_OPS["<="](lo, a) and _SCALAR_OPS["<="](a, hi)
+    return bounds.contains(a)
+
+
+# operator -> fn(a, b) -> bool; equality accepts any python types
+_SCALAR_OPS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": lambda a, b: bool(a == b),
+    "!=": lambda a, b: bool(a != b),
+    ">": _ordering(_op.gt, ">"),
+    ">=": _ordering(_op.ge, ">="),
+    "<": _ordering(_op.lt, "<"),
+    "<=": _ordering(_op.le, "<="),
+    "in": lambda a, b: _value_set(b).contains(a),
+    "not in": lambda a, b: not _value_set(b).contains(a),
+    "between": _between,
+}
+_MEMBERSHIP_OPS = ("in", "not in", "between")
+
+
+def _compare_scalar(operator: str, a: Any, b: Any) -> bool:
+    fn = _SCALAR_OPS.get(operator)
+    if fn is None:
+        raise ValueError(f"Unknown operator: {operator}")
+    return fn(a, b)
+
+
+# ---- elementwise comparison ----
+# Operators are applied to whole tensors/arrays so broadcasting and the work stay on the
+# operand's device; only the reduced scalars (one value each) are read back.
+
+_ELEMENTWISE_OPS = {
+    "==": _op.eq,
+    "!=": _op.ne,
+    ">": _op.gt,
+    ">=": _op.ge,
+    "<": _op.lt,
+    "<=": _op.le,
+}
+
+
+def _array_kind(x: Any) -> Optional[str]:
+    """'torch' / 'numpy' for tensors and ndarrays (detected without importing either), else None."""
+    mod = type(x).__module__.partition(".")[0]
+    if mod in ("torch", "numpy") and hasattr(x, "shape") and hasattr(x, "dtype"):
+        return mod
+    return None
+
+
+def _elementwise_operand(x: Any) -> Any:
+    if x is None:
+        return 0.0
+    if isinstance(x, dict) and "samples" in x:
+        return x["samples"]  # LATENT
+    if isinstance(x, str):
+        try:
+            return _to_number(x)
+        except TypeError:
+            return x
+    return x
+
+
+def _align(a: Any, b: Any) -> Tuple[Any, Any, Optional[str]]:
+    """Bring both operands into one array library (torch wins), on the array operand's device."""
+    kinds = (_array_kind(a), _array_kind(b))
+    if "torch" in kinds:
+        import torch
+
+        ref = a if kinds[0] == "torch" else b
+        if kinds[0] != "torch" and not isinstance(a, (int, float, bool)):
+            a = torch.as_tensor(a, device=ref.device)
+        if kinds[1] != "torch" and not isinstance(b, (int, float, bool)):
+            b = torch.as_tensor(b, device=ref.device)
+        return a, b, "torch"
+    if "numpy" in kinds:
+        import numpy
+
+        if not isinstance(a, (int, float, bool)):
+            a = numpy.asarray(a)
+        if not isinstance(b, (int, float, bool)):
+            b = numpy.asarray(b)
+        return a, b, "numpy"
+    return a, b, None
+
+
+def _membership_mask(operator: str, a: Any, values: _ValueSet, kind: str) -> Any:
+    """in / not in / between for a whole tensor/array: isin for members, searchsorted for ranges."""
+    if operator == "between" and not values.starts:
+        bounds = sorted(_to_number(v) for v in values.members)
+        if len(bounds) not in (1, 2):
+            raise ValueError("between needs exactly two bounds (lo, hi) or lo..hi ranges")
+        return (a >= bounds[0]) & (a <= bounds[-1])
+
+    members, starts, ends = values.arrays(a, kind)
+    if kind == "torch":
+        import torch
+
+        # compare in the promoted dtype so 1.5 never truncates to 1 against an int tensor
+        if members.numel():
+            common = torch.promote_types(a.dtype, members.dtype)
+            mask = torch.isin(a.to(common), members.to(common))
+        else:
+            mask = torch.zeros_like(a, dtype=torch.bool)
+        if starts.numel():
+            common = torch.promote_types(a.dtype, starts.dtype)
+            x = a.to(common).contiguous()
+            idx = torch.searchsorted(starts.to(common), x, right=True) - 1
+            mask |= (idx >= 0) & (x <= ends.to(common)[idx.clamp(min=0)])
+    else:
+        import numpy
+
+        mask = numpy.isin(a, members) if members.size else numpy.zeros(a.shape, dtype=bool)
+        if starts.size:
+            idx = numpy.searchsorted(starts, a, side="right") - 1
+            mask |= (idx >= 0) & (a <= ends[numpy.clip(idx, 0, None)])
+    return ~mask if operator == "not in" else mask
+
+
+def _compare_elementwise(operator: str, a: Any, b: Any) -> Tuple[Any, int, int]:
+    """Return (mask, count of True, element count); lists without arrays give a list mask."""
+    if operator in _MEMBERSHIP_OPS:
+        values = _value_set(b)
+        a, _, kind = _align(_elementwise_operand(a), 0)
+        if kind is not None:
+            mask = _membership_mask(operator, a, values, kind)
+            count = int(mask.sum().item()) if kind == "torch" else int(mask.sum())
+            return mask, count, (mask.numel() if kind == "torch" else int(mask.size))
+        a_items = a if isinstance(a, (list, tuple)) else [a]
+        fn = _SCALAR_OPS[operator]
+        mask = [fn(x, values) for x in a_items]
+        return mask, sum(mask), len(mask)
+
+    fn = _ELEMENTWISE_OPS[operator]
+    a, b, kind = _align(_elementwise_operand(a), _elementwise_operand(b))
+    if kind is not None:
+        mask = fn(a, b)
+        if kind == "torch":
+            return mask, int(mask.sum().item()), mask.numel()
+        return mask, int(mask.sum()), int(mask.size)
+
+    a_seq, b_seq = isinstance(a, (list, tuple)), isinstance(b, (list, tuple))
+    if a_seq and b_seq and len(a) != len(b):
+        raise ValueError(f"Cannot broadcast lists of length {len(a)} and {len(b)}")
+    n = len(a) if a_seq else (len(b) if b_seq else 1)
+    a_items = [_elementwise_operand(x) for x in a] if a_seq else [a] * n
+    b_items = [_elementwise_operand(x) for x in b] if b_seq else [b] * n
+    mask = [bool(fn(x, y)) for x, y in zip(a_items, b_items)]
+    return mask, sum(mask), n
+
+
+# ---- content fingerprints ----
+# == / != on big values compares short digests instead of walking the data. Tensors are hashed
+# with a position-mixed checksum computed in chunks on their own device (one scalar read back),
+# numpy arrays with blake2b over the raw bytes; sampled mode reads a fixed number of evenly
+# spaced blocks. Containers hash structurally, recombining their items' digests every time
+# (cheap next to the data, and never stale). Only the array digests are memoized by object
+# identity, through weak references so nothing is kept alive: tensors check their in-place
+# version counter (inference tensors have none and are not memoized), numpy arrays are only
+# memoized while read-only.
+
+_FP_CHUNK = 1 << 22
+_FP_SAMPLES = 16
+_FP_SAMPLE_BLOCK = 4096
+_MIX_A = 0x9E3779B97F4A7C15 - (1 << 64)  # golden-ratio constants as signed int64
+_MIX_B = 0xC2B2AE3D27D4EB4F - (1 << 64)
+
+_FP_WEAK: Dict[Tuple[int, bool], Tuple[Any, Any, bytes]] = {}
+_FP_LOCK = threading.Lock()
+
+
+def _int_view(t: Any) -> Any:
+    """Flat integer view of a tensor's storage bits (no conversion of values)."""
+    import torch
+
+    flat = t.detach().reshape(-1)
+    if flat.dtype == torch.bool:
+        return flat.view(torch.uint8)
+    ints = {1: torch.uint8, 2: torch.int16, 4: torch.int32, 8: torch.int64}
+    return flat.view(ints[flat.element_size()])
+
+
+def _tensor_digest(t: Any, sampled: bool) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{t.dtype}|{tuple(t.shape)}|".encode())
+    if t.is_complex():
+        import torch
+
+        t = torch.view_as_real(t)
+    flat = _int_view(t)
+    n = flat.shape[0]
+    if sampled and n > _FP_SAMPLES * _FP_SAMPLE_BLOCK:
+        step = n // _FP_SAMPLES
+        import torch
+
+        idx = torch.cat([
+            torch.arange(i * step, i * step + _FP_SAMPLE_BLOCK, device=flat.device) for i in range(_FP_SAMPLES)
+        ])
+        flat, n = flat[idx], idx.shape[0]
+
+    import torch
+
+    # the same checksum on every device, so equal values on cpu and cuda give equal digests
+    acc = torch.zeros((), dtype=torch.int64, device=flat.device)
+    for s in range(0, n, _FP_CHUNK):
+        x = flat[s : s + _FP_CHUNK].to(torch.int64)
+        pos = torch.arange(s, s + x.shape[0], dtype=torch.int64, device=flat.device)
+        acc += ((x ^ (pos * _MIX_A)) * _MIX_B).sum() + (x * (pos | 1)).sum()
+    h.update(struct.pack("<q", int(acc.item())))
+    return h.digest()
+
+
+def _ndarray_digest(a: Any, sampled: bool) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{a.dtype.str}|{a.shape}|".encode())
+    if a.dtype.hasobject:
+        h.update(_fingerprint(a.tolist(), sampled))
+        return h.digest()
+    flat = a.reshape(-1)
+    n = flat.shape[0]
+    if sampled and n > _FP_SAMPLES * _FP_SAMPLE_BLOCK:
+        step = n // _FP_SAMPLES
+        blocks = (flat[i * step : i * step + _FP_SAMPLE_BLOCK] for i in range(_FP_SAMPLES))
+    else:
+        blocks = (flat[s : s + _FP_CHUNK] for s in range(0, n, _FP_CHUNK))
+    for block in blocks:
+        h.update(memoryview(block.copy() if not block.flags.c_contiguous else block).cast("B"))
+    return h.digest()
+
+
+def _structural_digest(x: Any, sampled: bool) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(type(x).__name__.encode())
+    if isinstance(x, dict):
+        h.update(b"{")
+        # keys sorted by their own digest so insertion order doesn't matter
+        for kd, vd in sorted((_fingerprint(k, sampled), _fingerprint(v, sampled)) for k, v in x.items()):
+            h.update(kd)
+            h.update(vd)
+    elif isinstance(x, (list, tuple)):
+        h.update(b"[")
+        for v in x:
+            h.update(_fingerprint(v, sampled))
+    elif isinstance(x, (set, frozenset)):
+        h.update(b"{")
+        for d in sorted(_fingerprint(v, sampled) for v in x):
+            h.update(d)
+    else:
+        h.update(repr(x).encode("utf-8", "surrogatepass"))
+    return h.digest()
+
+
+def _fingerprint(x: Any, sampled: bool = False) -> bytes:
+    """16-byte content digest; equal values give equal digests (ints/floats/bools hash by value)."""
+    if x is None or isinstance(x, (bool, str, bytes)):
+        tag = (type(x).__name__, x)
+    elif isinstance(x, (int, float)):
+        tag = ("num", int(x) if isinstance(x, float) and x.is_integer() else x)  # 1 == 1.0
+    else:
+        tag = None
+    if tag is not None:
+        return hashlib.blake2b(repr(tag).encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    kind = _array_kind(x)
+    if kind is None:
+        return _structural_digest(x, sampled)
+
+    if kind == "torch" and x.is_inference():
+        # inference tensors (all of ComfyUI's) have no version counter to notice in-place writes
+        return _tensor_digest(x, sampled)
+
+    key = (id(x), sampled)
+    version = x._version if kind == "torch" else None
+    with _FP_LOCK:
+        hit = _FP_WEAK.get(key)
+        if hit is not None and hit[0]() is x and hit[1] == version:
+            return hit[2]
+
+    digest = _tensor_digest(x, sampled) if kind == "torch" else _ndarray_digest(x, sampled)
+    if kind == "numpy" and x.flags.writeable:
+        return digest  # no version counter to notice in-place writes
+    with _FP_LOCK:
+        try:
+            ref = weakref.ref(x, lambda _, key=key: _FP_WEAK.pop(key, None))
+        except TypeError:
+            return digest
+        _FP_WEAK[key] = (ref, version, digest)
+    return digest
+
+
 class Compare_AS:
     """
     Compare two values with an operator.
     - Inputs a,b: wildcard (optional). Unconnected defaults to 0.0.
-    - Operator: ==, !=, >, >=, <, <=
+    - Operator: ==, !=, >, >=, <, <=, in, not in, between
+    - in / not in / between: b (list input or text) or the values text; items are separated by
+      commas/semicolons/newlines, lo..hi is a range; between takes two bounds or ranges
+    - mode: scalar (default) compares whole values; elementwise compares tensors/arrays/lists
+      with broadcasting on their own device (LATENT dicts use their samples)
+    - mode fingerprint / fingerprint_sampled: ==/!= compare cached content digests (tensors,
+      arrays, nested dicts/lists such as conditioning); sampled hashes only a few blocks of
+      large arrays, so it can miss differences outside them
+    - reduce: how the elementwise mask becomes the BOOLEAN result (all / any)
+    - Outputs: result (BOOLEAN), mask (bool tensor/ndarray/list), count (INT, True elements),
+      fraction (FLOAT, count / elements)
+    """
+
+    RETURN_TYPES = ("BOOLEAN", WILDCARD, "INT", "FLOAT")
+    RETURN_NAMES = ("result", "mask", "count", "fraction")
+    FUNCTION = "compare"
+    CATEGORY = "AgaveSunset/AS"
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "operator": (["==", "!=", ">", ">=", "<", "<=", "in", "not in", "between"],),
+            },
+            "optional": {
+                "a": (WILDCARD,),
+                "b": (WILDCARD,),
+                "mode": (["scalar", "elementwise", "fingerprint", "fingerprint_sampled"], {"default": "scalar"}),
+                "reduce": (["all", "any"], {"default": "all"}),
+                "values": ("STRING", {"default": "", "multiline": True}),
+            },
+        }
+
+    def compare(
+        self,
+        operator: str,
+        a: Optional[Any] = None,
+        b: Optional[Any] = None,
+        mode: str = "scalar",
+        reduce: str = "all",
+        values: str = "",
+    ):
+        if operator in _MEMBERSHIP_OPS:
+            b = _value_set(b if b is not None else values)
+
+        if mode in ("fingerprint", "fingerprint_sampled"):
+            if operator not in ("==", "!="):
+                raise ValueError(f"Operator {operator!r} is not supported in {mode} mode; use == or !=")
+            a_val = 0.0 if a is None else a
+            b_val = 0.0 if b is None else b
+            sampled = mode == "fingerprint_sampled"
+            a_fp = _fingerprint(a_val, sampled)
+            b_fp = a_fp if a_val is b_val else _fingerprint(b_val, sampled)
+            res = (a_fp == b_fp) == (operator == "==")
+            ui_text = f"{a_fp.hex()[:12]} {operator} {b_fp.hex()[:12]} -> {res}"
+            return {"ui": {"text": [ui_text]}, "result": (res, res, int(res), float(res))}
+
+        if mode == "elementwise":
+            if operator not in _ELEMENTWISE_OPS and operator not in _MEMBERSHIP_OPS:
+                raise ValueError(f"Unknown operator: {operator}")
+            mask, count, total = _compare_elementwise(operator, a, b)
+            res = count == total if reduce == "all" else count > 0
+            fraction = count / total if total else 0.0
+            shape = tuple(mask.shape) if hasattr(mask, "shape") else (len(mask),)
+            ui_text = f"elementwise {operator} over {shape}: {count}/{total} true -> {reduce} = {res}"
+            return {"ui": {"text": [ui_text]}, "result": (res, mask, count, fraction)}
+
+        a_val = 0.0 if a is None else a
+        b_val = 0.0 if b is None else b
+
+        # ordering prefers numeric if both parse as numbers, then lexicographic for two strings
+        res = _compare_scalar(operator, a_val, b_val)
+        b_desc = b_val.describe() if isinstance(b_val, _ValueSet) else repr(b_val)
+        ui_text = f"{a_val!r} {operator} {b_desc} -> {res}"
+        return {"ui": {"text": [ui_text]}, "result": (res, res, int(res), float(res))}
+
+
+# ---- multi-predicate comparison ----
+# A predicate string is parsed once (ast, cached by text) into a tree of closures over the
+# dispatch table; evaluation then only walks that tree and stops at the first deciding result.
+
+_PREDICATE_NAMES = ("a", "b", "c", "d")
+_AST_OPS = {
+    ast.Eq: "==",
+    ast.NotEq: "!=",
+    ast.Gt: ">",
+    ast.GtE: ">=",
+    ast.Lt: "<",
+    ast.LtE: "<=",
+    ast.In: "in",
+    ast.NotIn: "not in",
+}
+
+Env = Dict[str, Any]
+
+
+def _compile_operand(node: ast.AST) -> Callable[[Env], Any]:
+    if isinstance(node, ast.Name):
+        if node.id not in _PREDICATE_NAMES:
+            raise ValueError(f"Unknown name {node.id!r}; use {', '.join(_PREDICATE_NAMES)}")
+        name = node.id
+        return lambda env: env[name]
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str, bool)):
+        value = node.value
+        return lambda env: value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)) and isinstance(
+        node.operand, ast.Constant
+    ) and isinstance(node.operand.value, (int, float)):
+        value = -node.operand.value if isinstance(node.op, ast.USub) else node.operand.value
+        return lambda env: value
+    raise ValueError(f"Unsupported operand: {ast.dump(node)}")
+
+
+def _compile_predicate(node: ast.AST) -> Callable[[Env], bool]:
+    if isinstance(node, ast.BoolOp):
+        parts = [_compile_predicate(v) for v in node.values]
+        if isinstance(node.op, ast.And):
+            return lambda env: all(p(env) for p in parts)
+        return lambda env: any(p(env) for p in parts)
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        inner = _compile_predicate(node.operand)
+        return lambda env: not inner(env)
+
+    if isinstance(node, ast.Compare):
+        # chained: lo <= x < hi -> (lo <= x) and (x < hi), each operand evaluated once
+        operands = [_compile_operand(node.left)] + [_compile_operand(c) for c in node.comparators]
+        fns = []
+        for o in node.ops:
+            symbol = _AST_OPS.get(type(o))
+            if symbol is None:
+                raise ValueError(f"Unsupported operator: {type(o).__name__}")
+            fns.append(_SCALAR_OPS[symbol])
+
+        def chain(env: Env) -> bool:
+            left = operands[0](env)
+            for fn, operand in zip(fns, operands[1:]):
+                right = operand(env)
+                if not fn(left, right):
+                    return False
+                left = right
+            return True
+
+        return chain
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, bool):
+        value = node.value
+        return lambda env: value
+    raise ValueError(f"Unsupported predicate: {ast.dump(node)}")
+
+
+def _split_statements(line: str) -> List[str]:
+    """Split a line on ';' outside string literals (a in '1;2;3' stays whole)."""
+    cuts = []
+    try:
+        for tok in tokenize.generate_tokens(iter([line]).__next__):
+            if tok.type == tokenize.ERRORTOKEN:
+                raise tokenize.TokenError(tok.string)
+            if tok.type == tokenize.OP and tok.string == ";":
+                cuts.append(tok.start[1])
+    except (tokenize.TokenError, SyntaxError):
+        cuts = []  # e.g. an unclosed quote: keep the line whole so ast reports it
+    bounds = [-1] + cuts + [len(line)]
+    return [line[lo + 1 : hi] for lo, hi in zip(bounds, bounds[1:])]
+
+
+@lru_cache(maxsize=256)
+def _parse_predicates(text: str) -> Tuple[Tuple[str, Callable[[Env], bool]], ...]:
+    """One compiled predicate per non-empty line (or ';'-separated part)."""
+    out = []
+    for part in (p for line in text.splitlines() for p in _split_statements(line)):
+        part = part.strip()
+        if not part or part.startswith("#"):
+            continue
+        try:
+            tree = ast.parse(part, mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"Invalid predicate {part!r}: {e.msg}") from e
+        out.append((part, _compile_predicate(tree.body)))
+    return tuple(out)
+
+
+class CompareMulti_AS:
+    """
+    Multi-predicate compare (CompareMulti_AS)
+
+    - Inputs a,b,c,d: wildcard (optional). Unconnected defaults to 0.0.
+    - predicates: one predicate per line (or ';'-separated), python-style chains and and/or/not,
+      e.g. "b <= a < c and d != 0"
+    - predicate_list (optional): list of (a, op, b) tuples with values, evaluated after the text
+    - combine: AND (all predicates) / OR (any predicate); evaluation stops at the deciding one
     - Output: BOOLEAN
     """
 
@@ -71,60 +736,83 @@ class Compare_AS:
     def INPUT_TYPES(cls):
         return {
             "required": {
-                "operator": (["==", "!=", ">", ">=", "<", "<="],),
+                "predicates": ("STRING", {"default": "a > b", "multiline": True}),
+                "combine": (["AND", "OR"], {"default": "AND"}),
             },
             "optional": {
                 "a": (WILDCARD,),
                 "b": (WILDCARD,),
+                "c": (WILDCARD,),
+                "d": (WILDCARD,),
+                "predicate_list": (WILDCARD,),
             },
         }
 
-    def compare(self, operator: str, a: Optional[Any] = None, b: Optional[Any] = None):
-        a_val = 0.0 if a is None else a
-        b_val = 0.0 if b is None else b
+    @classmethod
+    def VALIDATE_INPUTS(cls, predicates=None):
+        if predicates is None:
+            return True
+        try:
+            _parse_predicates(predicates)
+        except ValueError as e:
+            return str(e)
+        return True
 
-        # equality: allow any python types
-        if operator == "==":
-            res = (a_val == b_val)
-        elif operator == "!=":
-            res = (a_val != b_val)
-        else:
-            # ordering: prefer numeric if both parse as numbers
-            try:
-                a_num = _to_number(a_val)
-                b_num = _to_number(b_val)
-                if operator == ">":
-                    res = a_num > b_num
-                elif operator == ">=":
-                    res = a_num >= b_num
-                elif operator == "<":
-                    res = a_num < b_num
-                elif operator == "<=":
-                    res = a_num <= b_num
-                else:
-                    raise ValueError(f"Unknown operator: {operator}")
-            except Exception:
-                # fallback: lexicographic only when both are strings
-                if isinstance(a_val, str) and isinstance(b_val, str):
-                    if operator == ">":
-                        res = a_val > b_val
-                    elif operator == ">=":
-                        res = a_val >= b_val
-                    elif operator == "<":
-                        res = a_val < b_val
-                    elif operator == "<=":
-                        res = a_val <= b_val
-                    else:
-                        raise ValueError(f"Unknown operator: {operator}")
-                else:
-                    raise TypeError(
-                        f"Operator {operator!r} requires numeric or string inputs for ordering."
-                    )
-
-        ui_text = f"{a_val!r} {operator} {b_val!r} -> {bool(res)}"
-        return {"ui": {"text": [ui_text]}, "result": (bool(res),)}
+    @staticmethod
+    def _listed(predicate_list: Any) -> List[Tuple[str, Callable[[Env], bool]]]:
+        if predicate_list is None:
+            return []
+        if isinstance(predicate_list, tuple) and len(predicate_list) == 3 and isinstance(predicate_list[1], str):
+            predicate_list = [predicate_list]
+        out = []
+        for item in predicate_list:
+            if not isinstance(item, (list, tuple)) or len(item) != 3:
+                raise ValueError(f"Predicate must be (a, op, b), got {item!r}")
+            lhs, symbol, rhs = item
+            fn = _SCALAR_OPS.get(symbol)
+            if fn is None:
+                raise ValueError(f"Unknown operator: {symbol}")
+            out.append((f"{lhs!r} {symbol} {rhs!r}", lambda env, fn=fn, lhs=lhs, rhs=rhs: fn(lhs, rhs)))
+        return out
+
+    def compare(
+        self,
+        predicates: str,
+        combine: str = "AND",
+        a: Optional[Any] = None,
+        b: Optional[Any] = None,
+        c: Optional[Any] = None,
+        d: Optional[Any] = None,
+        predicate_list: Optional[Any] = None,
+    ):
+        env = {k: (0.0 if v is None else v) for k, v in zip(_PREDICATE_NAMES, (a, b, c, d))}
+        compiled = list(_parse_predicates(predicates or "")) + self._listed(predicate_list)
+        if not compiled:
+            raise ValueError("No predicates given")
+
+        decide = combine == "OR"  # the result that ends evaluation early
+        res = not decide
+        lines = []
+        for i, (label, pred) in enumerate(compiled):
+            value = pred(env)
+            lines.append(f"{label} -> {value}")
+            if value == decide:
+                res = decide
+                skipped = len(compiled) - i - 1
+                if skipped:
+                    lines.append(f"({skipped} more skipped)")
+                break
+
+        ui_text = "\n".join(lines + [f"{combine} -> {res}"])
+        return {"ui": {"text": [ui_text]}, "result": (res,)}
 
 
 # registration (keep old type key; unify display name suffix)
-NODE_CLASS_MAPPINGS = {"CompareAgaveSunset": Compare_AS}
-NODE_DISPLAY_NAME_MAPPINGS = {"CompareAgaveSunset": "Compare_AS"}
+NODE_CLASS_MAPPINGS = {
+    "CompareAgaveSunset": Compare_AS,
+    "CompareMultiAgaveSunset": CompareMulti_AS,
+}
+NODE_DISPLAY_NAME_MAPPINGS = {
+    "CompareAgaveSunset": "Compare_AS",
+    "CompareMultiAgaveSunset": "CompareMulti_AS",
+}
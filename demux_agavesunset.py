@@ -1,8 +1,10 @@
-# demux_agavesunset.py — one input to multiple outputs (10-way demux)
+# demux_agavesunset.py — one input to multiple outputs (10-way demux, more via ways)
 
 from __future__ import annotations
 
-from typing import Any
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
 
 
 class AnyType(str):
@@ -27,12 +29,173 @@ except Exception:
                 self.message = message
 
 
+_MAX_WAYS = 1024
+_SELECTED_INDEX_SLOT = 10  # out0..out9, selected_index, positions, out10, out11, ... (old links keep their slot)
+_FIXED_OUTPUTS = 12
+
+
+class _OpenTypes(tuple):
+    """RETURN_TYPES/RETURN_NAMES whose extra slots (out10+, added by the web extension) are wildcards."""
+
+    def __new__(cls, items, extra):
+        self = super().__new__(cls, items)
+        self._extra = extra
+        return self
+
+    def __getitem__(self, i):
+        if isinstance(i, int) and i >= _FIXED_OUTPUTS:
+            return self._extra(i)
+        return super().__getitem__(i)
+
+
+@lru_cache(maxsize=64)
+def _key_table(keys: str) -> Dict[str, int]:
+    """
+    name -> slot, built once per keys text. One name per line (or comma separated) takes the
+    next slot; "name = 7" / "name: 7" pins a slot and continues counting from there.
+    """
+    table: Dict[str, int] = {}
+    slot = 0
+    for part in re.split(r"[\r\n,]+", keys or ""):
+        part = part.strip()
+        if not part:
+            continue
+        name, sep, pinned = part.partition("=") if "=" in part else part.partition(":")
+        name = name.strip()
+        if sep and pinned.strip().lstrip("-").isdigit():
+            slot = int(pinned)
+        table[name] = slot
+        slot += 1
+    return table
+
+
+def _select_slot(index: Any, key: Any, keys: str) -> int:
+    """Slot chosen by key (name lookup, or a plain number) when given, else by index; -1 if unknown."""
+    if key is None or (isinstance(key, str) and not key.strip()):
+        return int(index)
+    if isinstance(key, (int, float)) and not isinstance(key, bool):
+        return int(key)
+    name = str(key).strip()
+    slot = _key_table(keys).get(name)
+    if slot is not None:
+        return slot
+    return int(name) if name.lstrip("-").isdigit() else -1
+
+
+def _output_slot(n: int) -> int:
+    """Position of outN in the result tuple."""
+    return n if n < _SELECTED_INDEX_SLOT else n + _FIXED_OUTPUTS - _SELECTED_INDEX_SLOT
+
+
+def _result_size(ways: int) -> int:
+    return max(_FIXED_OUTPUTS, _output_slot(ways - 1) + 1)
+
+
+def _is_tensor(v: Any) -> bool:
+    return type(v).__module__.partition(".")[0] == "torch" and hasattr(v, "index_select")
+
+
+def _take_rows(t: Any, pos: Any) -> Any:
+    """Rows pos of t: a zero-copy slice when they are one contiguous run, else one index_select."""
+    n = pos.shape[0]
+    first = int(pos[0])
+    if int(pos[-1]) - first + 1 == n:
+        return t[first : first + n]
+    return t.index_select(0, pos.to(t.device))
+
+
+def _multi_slots(multi: Any, keys: str, ways: int) -> List[int]:
+    """
+    Output numbers from a mask, a list of numbers/keys, or "0, 3, face".
+    A mask is a bool list/tensor/array, or a list/tensor of exactly `ways` zeros and ones;
+    other 0/1 lists that repeat a number ([1, 0, 1] with ways=10) are refused as ambiguous.
+    """
+    if isinstance(multi, str):
+        return sorted({_select_slot(0, s, keys) for s in re.split(r"[\s,;]+", multi) if s})
+    is_bool = str(getattr(multi, "dtype", "")) in ("bool", "torch.bool")
+    if hasattr(multi, "tolist"):
+        multi = multi.tolist()
+    elif isinstance(multi, (int, float)):
+        multi = [multi]
+    items = list(multi) if isinstance(multi, (list, tuple)) else [multi]
+    if is_bool or (items and all(isinstance(x, bool) for x in items)):
+        return [i for i, on in enumerate(items) if on]
+    if len(items) > 1 and all(type(x) in (int, float) and x in (0, 1) for x in items):
+        if len(items) == ways:
+            return [i for i, on in enumerate(items) if on]
+        if len(set(items)) < len(items):
+            raise ValueError(
+                f"[Demux_AS] multi_select {items} is ambiguous: a 0/1 mask needs exactly {ways} entries "
+                "(one per output), output numbers must not repeat"
+            )
+    return sorted({_select_slot(0, x, keys) for x in items})
+
+
+def _scatter(value: Any, select: Any, keys: str) -> Tuple[Dict[int, Any], Dict[int, List[int]]]:
+    """Split a batch by per-item output number: {out: sub-batch}, {out: original positions}."""
+    latent = isinstance(value, dict) and "samples" in value
+    batch = value["samples"] if latent else value
+
+    if _is_tensor(select) or _is_tensor(batch):
+        import torch
+
+        if _is_tensor(select):
+            sel = select.reshape(-1).long()
+        else:
+            if hasattr(select, "tolist"):
+                select = select.tolist()
+            sel = torch.tensor([_select_slot(0, s, keys) for s in select], dtype=torch.long)
+        sel = sel.to(batch.device) if _is_tensor(batch) else sel
+    else:
+        sel = None
+
+    size = len(batch) if not _is_tensor(batch) else batch.shape[0]
+    if sel is None:
+        items = select.tolist() if hasattr(select, "tolist") else list(select)
+        items = [_select_slot(0, s, keys) for s in items]
+        if len(items) != size:
+            raise ValueError(f"[Demux_AS] scatter needs one selection per item ({len(items)} for {size})")
+        groups: Dict[int, List[int]] = {}
+        for i, k in enumerate(items):
+            groups.setdefault(k, []).append(i)
+        return {k: [batch[i] for i in pos] for k, pos in groups.items()}, groups
+
+    if sel.shape[0] != size:
+        raise ValueError(f"[Demux_AS] scatter needs one selection per item ({sel.shape[0]} for {size})")
+    parts: Dict[int, Any] = {}
+    positions: Dict[int, List[int]] = {}
+    for k in torch.unique(sel).tolist():
+        pos = (sel == k).nonzero().squeeze(1)
+        positions[k] = pos.tolist()
+        if not latent:
+            parts[k] = _take_rows(batch, pos) if _is_tensor(batch) else [batch[i] for i in positions[k]]
+            continue
+        sub = dict(value)
+        sub["samples"] = _take_rows(batch, pos)
+        mask = value.get("noise_mask")
+        if _is_tensor(mask) and mask.shape[0] == size:
+            sub["noise_mask"] = _take_rows(mask, pos)
+        if isinstance(value.get("batch_index"), list) and len(value["batch_index"]) == size:
+            sub["batch_index"] = [value["batch_index"][i] for i in positions[k]]
+        parts[k] = sub
+    return parts, positions
+
+
 class Demux_AS:
     """
-    Routes an input to one of 10 outputs based on integer selection [0..9].
+    Routes an input to one of `ways` outputs (default 10) based on integer selection.
+    - select by index, or by key: keys lists one name per line (slot = line, or "name = slot"),
+      looked up in a table built once per keys text.
     - Only selected output propagates the input.
     - Other outputs return an ExecutionBlocker to stop unused branches.
-    - Also outputs selected_index.
+    - multi_select (optional mask, list of numbers/keys, or "0, 3, face"): every selected output
+      receives the same input object (shared, not copied); selected_index is then a list.
+      A mask is bool, or exactly `ways` zeros/ones; a shorter 0/1 list with repeats is an error.
+    - scatter (optional list/tensor): item i of an IMAGE/MASK/LATENT batch (or list) goes to
+      output scatter[i]; each output gets one sub-batch (a slice view when the items are
+      contiguous, else one index_select); outputs that receive nothing stay blocked.
+    - Also outputs selected_index (slot 10) and positions (slot 11: per output, the original
+      item positions it received, for reassembly); out10+ follow so old links keep their slot.
     """
 
     FUNCTION = "demux"
@@ -43,17 +206,80 @@ class Demux_AS:
         return {
             "required": {
                 "input": (WILDCARD,),
-                "select": ("INT", {"default": 0, "min": 0, "max": 9, "step": 1, "display": "number"}),
-            }
+                "select": ("INT", {"default": 0, "min": 0, "max": _MAX_WAYS - 1, "step": 1, "display": "number"}),
+            },
+            "optional": {
+                "key": ("STRING", {"default": ""}),
+                "keys": ("STRING", {"default": "", "multiline": True}),
+                "ways": ("INT", {"default": 10, "min": 1, "max": _MAX_WAYS, "step": 1}),
+                "scatter": (WILDCARD,),
+                "multi_select": (WILDCARD,),
+            },
         }
 
-    RETURN_TYPES = (WILDCARD,) * 10 + ("INT",)
-    RETURN_NAMES = tuple(f"out{i}" for i in range(10)) + ("selected_index",)
+    RETURN_TYPES = _OpenTypes((WILDCARD,) * 10 + ("INT", WILDCARD), lambda i: WILDCARD)
+    RETURN_NAMES = _OpenTypes(
+        tuple(f"out{i}" for i in range(10)) + ("selected_index", "positions"),
+        lambda i: f"out{i - _FIXED_OUTPUTS + _SELECTED_INDEX_SLOT}",
+    )
+
+    def _demux_multi(self, value: Any, multi_select: Any, keys: str, ways: int):
+        sel = _multi_slots(multi_select, keys, ways)
+        bad = [k for k in sel if not 0 <= k < ways]
+        if bad:
+            raise ValueError(f"[Demux_AS] multi_select outputs {bad} outside 0..{ways - 1}")
+
+        # Only unwrap singleton lists to avoid destroying intentional lists
+        if isinstance(value, list) and len(value) == 1:
+            value = value[0]
+
+        outputs = [ExecutionBlocker(None)] * _result_size(ways)
+        for k in sel:
+            outputs[_output_slot(k)] = value  # same object on every selected output
+        outputs[_SELECTED_INDEX_SLOT] = sel
+        outputs[_SELECTED_INDEX_SLOT + 1] = None
+
+        ui_text = f"select: {sel}\nselected: " + (", ".join(f"out{k}" for k in sel) or "none")
+        return {"ui": {"text": [ui_text]}, "result": tuple(outputs)}
+
+    def _demux_scatter(self, value: Any, scatter: Any, keys: str, ways: int):
+        parts, positions = _scatter(value, scatter, keys)
+        bad = [k for k in parts if not 0 <= k < ways]
+        if bad:
+            raise ValueError(f"[Demux_AS] scatter selects outputs {bad} outside 0..{ways - 1}")
+
+        outputs = [ExecutionBlocker(None)] * _result_size(ways)
+        for k, part in parts.items():
+            outputs[_output_slot(k)] = part
+        used = sorted(parts)
+        outputs[_SELECTED_INDEX_SLOT] = used
+        outputs[_SELECTED_INDEX_SLOT + 1] = [positions.get(k, []) for k in range(ways)]
+
+        routed = ", ".join(f"out{k}: {len(positions[k])}" for k in used)
+        ui_text = f"scatter: {sum(len(p) for p in positions.values())} items\nrouted: {routed}"
+        return {"ui": {"text": [ui_text]}, "result": tuple(outputs)}
+
+    def demux(
+        self,
+        input: Any,
+        select: int,
+        key: str = "",
+        keys: str = "",
+        ways: int = 10,
+        scatter: Any = None,
+        multi_select: Any = None,
+    ):
+        ways = max(int(ways), 1)
+        if scatter is not None:
+            return self._demux_scatter(input, scatter, keys, ways)
+        if multi_select is not None:
+            return self._demux_multi(input, multi_select, keys, ways)
 
-    def demux(self, input: Any, select: int):
-        sel = int(select)
-        if not (0 <= sel <= 9):
-            raise ValueError(f"[Demux_AS] 'select' must be between 0 and 9 (got {sel})")
+        sel = _select_slot(select, key, keys)
+        if not (0 <= sel < ways):
+            if isinstance(key, str) and key.strip() and sel < 0:
+                raise ValueError(f"[Demux_AS] unknown key {key!r}")
+            raise ValueError(f"[Demux_AS] 'select' must be between 0 and {ways - 1} (got {sel})")
 
         value = input
         # Only unwrap singleton lists to avoid destroying intentional lists
@@ -61,9 +287,10 @@ class Demux_AS:
             value = value[0]
 
         blocker = ExecutionBlocker(None)
-        outputs = [blocker for _ in range(10)]
-        outputs[sel] = value
-        outputs.append(sel)
+        outputs = [blocker] * _result_size(ways)
+        outputs[_SELECTED_INDEX_SLOT] = sel
+        outputs[_SELECTED_INDEX_SLOT + 1] = None
+        outputs[_output_slot(sel)] = value
 
         ui_text = f"select: {sel}\nselected: out{sel}"
         return {"ui": {"text": [ui_text]}, "result": tuple(outputs)}
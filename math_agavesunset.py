@@ -6,7 +6,13 @@ import ast
 import math
 import operator as op
 import random
-from typing import Any, Dict
+from array import array
+import re
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
 class AnyType(str):
@@ -16,14 +22,65 @@ class AnyType(str):
 
 WILDCARD = AnyType("*")
 
+# ---- resource budget ----
+# Python ints are arbitrary precision, so 9**9**9 or 1 << 10**9 would pin the
+# executor thread. Big-integer ops are checked before they run; expression size
+# is checked at compile time.
+_MAX_INT_BITS = 1 << 16  # ~19.7k decimal digits, for intermediate values
+_MAX_FLOAT_BITS = 1024  # results must still fit the FLOAT output
+_MAX_NODES = 1000
+# the optimizer/compiler passes recurse per tree level and a+b+c+... nests one level per
+# term, so this is what keeps them off the recursion limit (~300 levels are safe); it
+# matches CPython's own limit of 200 nested parentheses and still allows 200-term sums
+_MAX_DEPTH = 200
+
+
+def _short(x: int) -> str:
+    # never stringify a huge int in an error message (that alone can be slow or raise)
+    return str(x) if x.bit_length() <= 64 else f"<{x.bit_length()}-bit int>"
+
+
+def _check_bits(bits: int, what: str) -> None:
+    if bits > _MAX_INT_BITS:
+        raise OverflowError(f"{what} would need ~{bits} bits, over the {_MAX_INT_BITS}-bit integer budget")
+
+
+def _budget_pow(a, b):
+    if type(a) is int and type(b) is int and b > 0 and abs(a) > 1:
+        # lower bound of the result size, so nothing that fits is rejected
+        _check_bits((abs(a).bit_length() - 1) * b + 1, f"{_short(a)} ** {_short(b)}")
+    return op.pow(a, b)
+
+
+def _budget_lshift(a, b):
+    if type(a) is int and type(b) is int and a and b > 0:
+        _check_bits(a.bit_length() + b, f"{_short(a)} << {_short(b)}")
+    return op.lshift(a, b)
+
+
+def _budget_mul(a, b):
+    if type(a) is int and type(b) is int and a and b:
+        bits = a.bit_length() + b.bit_length()
+        if bits > _MAX_INT_BITS:
+            _check_bits(bits - 1, f"{_short(a)} * {_short(b)}")
+    return op.mul(a, b)
+
+
+def _int_float(r) -> Tuple[int, float]:
+    """(INT, FLOAT) outputs of a result; an int beyond the float range is a budget error too."""
+    if type(r) is int and r.bit_length() > _MAX_FLOAT_BITS:
+        raise OverflowError(f"result {_short(r)} is outside the FLOAT output range (under 2**{_MAX_FLOAT_BITS})")
+    return int(r), float(r)
+
+
 # operators allowed
 _OPERATORS = {
     ast.Add: op.add,
     ast.Sub: op.sub,
-    ast.Mult: op.mul,
+    ast.Mult: _budget_mul,
     ast.Div: op.truediv,
     ast.FloorDiv: op.floordiv,
-    ast.Pow: op.pow,
+    ast.Pow: _budget_pow,
     ast.BitXor: op.xor,
     ast.USub: op.neg,
     ast.Mod: op.mod,
@@ -34,21 +91,73 @@ _OPERATORS = {
     ast.Or: lambda a, b: 1 if a or b else 0,
     ast.Not: lambda a: 0 if a else 1,
     ast.RShift: op.rshift,
-    ast.LShift: op.lshift,
+    ast.LShift: _budget_lshift,
 }
 
+# ---- tensor reductions ----
+# Run on the tensor's own device; only the final scalar is synced back (.item()).
+
+
+def _tensor_data(x):
+    # latent dict -> its samples tensor
+    if isinstance(x, dict) and "samples" in x:
+        return x["samples"]
+    return x
+
+
+def _reduction(how: str):
+    scalar = {"min": min, "max": max, "sum": sum}.get(how)
+
+    def call(*args):
+        if len(args) > 1:
+            return scalar(*args)
+        x = _tensor_data(args[0])
+        xp = _xp(x)
+        if xp is not None:
+            if how == "mean" and not _is_float_array(x):
+                x = x.float() if xp.__name__ == "torch" else x.astype(xp.float64)
+            elif how == "sum" and str(x.dtype) in ("bool", "torch.bool"):
+                x = _to_int64(x)
+            return getattr(x, how)().item()
+        if isinstance(x, (list, tuple)):
+            return sum(x) / len(x) if how == "mean" else scalar(x)
+        return x
+
+    return call
+
+
 # functions allowed in expressions
+# "tensor" entries receive bare input names (a/b/c) as-is, so tensors, latents and lists can be reduced
 _FUNCTIONS: Dict[str, Dict[str, Any]] = {
     "round": {"args": (1, 2), "call": lambda a, b=None: round(a, b), "hint": "number, dp? = 0"},
     "ceil": {"args": (1, 1), "call": lambda a: math.ceil(a), "hint": "number"},
     "floor": {"args": (1, 1), "call": lambda a: math.floor(a), "hint": "number"},
-    "min": {"args": (2, None), "call": lambda *args: min(*args), "hint": "...numbers"},
-    "max": {"args": (2, None), "call": lambda *args: max(*args), "hint": "...numbers"},
-    "randomint": {"args": (2, 2), "call": lambda a, b: random.randint(a, b), "hint": "min, max"},
-    "randomchoice": {"args": (2, None), "call": lambda *args: random.choice(args), "hint": "...numbers"},
+    "min": {"args": (1, None), "call": _reduction("min"), "hint": "...numbers | tensor", "tensor": True},
+    "max": {"args": (1, None), "call": _reduction("max"), "hint": "...numbers | tensor", "tensor": True},
+    "sum": {"args": (1, 1), "call": _reduction("sum"), "hint": "tensor | list", "tensor": True},
+    "mean": {"args": (1, 1), "call": _reduction("mean"), "hint": "tensor | list", "tensor": True},
+    # "random" entries also receive rng= (the module, or a seeded random.Random)
+    "randomint": {
+        "args": (2, 2),
+        "call": lambda a, b, rng=random: rng.randint(a, b),
+        "hint": "min, max",
+        "random": True,
+    },
+    "randomchoice": {
+        "args": (2, None),
+        "call": lambda *args, rng=random: rng.choice(args),
+        "hint": "...numbers",
+        "random": True,
+    },
     "sqrt": {"args": (1, 1), "call": lambda a: math.sqrt(a), "hint": "number"},
     "int": {"args": (1, 1), "call": lambda a=None: int(a), "hint": "number"},
-    "iif": {"args": (3, 3), "call": lambda a, b, c=None: b if a else c, "hint": "cond, true, false"},
+    "iif": {
+        "args": (3, 3),
+        "call": lambda a, b, c=None: b if a else c,
+        # lazy form receives zero-arg thunks so only the taken branch is evaluated
+        "lazy": lambda a, b, c: b() if a() else c(),
+        "hint": "cond, true, false",
+    },
 }
 
 autocompleteWords = [
@@ -56,6 +165,981 @@ autocompleteWords = [
     for x in _FUNCTIONS.keys()
 ]
 
+seedInput = (
+    "INT",
+    {
+        "default": -1,
+        "min": -1,
+        "max": 0xFFFFFFFFFFFFFFFF,
+        "tooltip": "seed for randomint/randomchoice; -1 = unseeded (always re-run)",
+    },
+)
+
+_COMPARE_OPS = {
+    ast.Eq: op.eq,
+    ast.NotEq: op.ne,
+    ast.Gt: op.gt,
+    ast.GtE: op.ge,
+    ast.Lt: op.lt,
+    ast.LtE: op.le,
+}
+
+# a.<attr> answered from tensor metadata (shape/dtype only, never the data)
+_SIZE_ATTRS = ("width", "height", "batch", "channels", "frames", "nbytes")
+_INPUT_NAMES = ("a", "b", "c")
+
+
+def _as_number(x):
+    if isinstance(x, bool):
+        return int(x)
+    if isinstance(x, int):
+        return x
+    return float(x)
+
+
+def _normalize_expression(expression: str) -> str:
+    return (expression or "").replace("\n", " ").replace("\r", "")
+
+
+# ---- optimizer: constant folding + dead-branch elimination ----
+# Runs between parsing and compilation. Folding only replaces a sub-tree when it
+# evaluates cleanly; anything that would raise is left alone so the error still
+# surfaces at run time with the interpreter's message.
+
+_FOLDABLE = (int, float, bool, complex, str)
+_FOLD_MAX_BITS = 4096  # larger ints stay unfolded so trees remain printable/hashable via ast.dump
+
+
+def _is_const(n: ast.AST) -> bool:
+    return isinstance(n, ast.Constant) and isinstance(n.value, _FOLDABLE)
+
+
+def _const(value, like: ast.AST) -> ast.Constant:
+    if type(value) is int and value.bit_length() > _FOLD_MAX_BITS:
+        raise OverflowError("constant too large to fold")
+    return ast.copy_location(ast.Constant(value=value), like)
+
+
+class _Optimizer(ast.NodeTransformer):
+    def visit_BinOp(self, n: ast.BinOp):
+        self.generic_visit(n)
+        fn = _OPERATORS.get(type(n.op))
+        if fn is not None and _is_const(n.left) and _is_const(n.right):
+            try:
+                return _const(fn(_as_number(n.left.value), _as_number(n.right.value)), n)
+            except Exception:
+                pass
+        return n
+
+    def visit_UnaryOp(self, n: ast.UnaryOp):
+        self.generic_visit(n)
+        fn = _OPERATORS.get(type(n.op))
+        if fn is not None and _is_const(n.operand):
+            try:
+                return _const(fn(_as_number(n.operand.value)), n)
+            except Exception:
+                pass
+        return n
+
+    def visit_BoolOp(self, n: ast.BoolOp):
+        self.generic_visit(n)
+        # And stops at the first falsy operand, Or at the first truthy one
+        stop = isinstance(n.op, ast.Or)
+        if not isinstance(n.op, (ast.And, ast.Or)):
+            return n
+        values = []
+        for v in n.values:
+            values.append(v)
+            if _is_const(v) and bool(v.value) is stop:
+                break
+        if _is_const(values[0]) and bool(values[0].value) is stop:
+            return _const(1 if stop else 0, n)
+        if all(_is_const(v) for v in values):
+            truthy = [bool(v.value) for v in values]
+            return _const(int(any(truthy)) if stop else int(all(truthy)), n)
+        n.values = values
+        return n
+
+    def visit_Compare(self, n: ast.Compare):
+        self.generic_visit(n)
+        if not (_is_const(n.left) and all(_is_const(c) for c in n.comparators)):
+            return n
+        left = n.left.value
+        for op_node, comp in zip(n.ops, n.comparators):
+            cmp = _COMPARE_OPS.get(type(op_node))
+            if cmp is None:
+                return n
+            try:
+                ok = cmp(left, comp.value)
+            except Exception:
+                return n
+            if not ok:
+                return _const(0, n)
+            left = comp.value
+        return _const(1, n)
+
+    def visit_Call(self, n: ast.Call):
+        self.generic_visit(n)
+        if not isinstance(n.func, ast.Name) or n.func.id not in _FUNCTIONS:
+            return n
+        fn = _FUNCTIONS[n.func.id]
+        min_args, max_args = fn["args"]
+        argc = len(n.args)
+        if argc < min_args or (max_args is not None and argc > max_args):
+            return n
+        if n.func.id == "iif" and _is_const(n.args[0]):
+            return n.args[1] if n.args[0].value else n.args[2]
+        if fn.get("random") or not all(_is_const(a) for a in n.args):
+            return n
+        try:
+            value = fn["call"](*[a.value for a in n.args])
+            return _const(value, n) if isinstance(value, _FOLDABLE) else n
+        except Exception:
+            return n
+
+
+# ---- common sub-expressions ----
+# Pure, non-trivial sub-trees that occur more than once (e.g. a.width used five
+# times) are compiled once and memoised per evaluation in _EvalContext.memo.
+
+_CSE_NODES = (ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.Attribute, ast.Call)
+
+
+def _is_random_call(n: ast.AST) -> bool:
+    return (
+        isinstance(n, ast.Call)
+        and isinstance(n.func, ast.Name)
+        and bool(_FUNCTIONS.get(n.func.id, {}).get("random"))
+    )
+
+
+def _shared_subtrees(tree: ast.AST) -> Dict[int, int]:
+    """Map id(node) -> memo slot for every repeated pure sub-tree."""
+    keys: Dict[int, str] = {}
+    counts: Dict[str, int] = {}
+    impure = set()
+
+    def walk(n: ast.AST) -> bool:
+        pure = not _is_random_call(n)
+        for child in ast.iter_child_nodes(n):
+            pure = walk(child) and pure
+        if isinstance(n, _CSE_NODES):
+            key = ast.dump(n)
+            keys[id(n)] = key
+            counts[key] = counts.get(key, 0) + 1
+            if not pure:
+                impure.add(key)
+        return pure
+
+    walk(tree)
+    slots: Dict[str, int] = {}
+    shared: Dict[int, int] = {}
+    for node_id, key in keys.items():
+        if counts[key] > 1 and key not in impure:
+            shared[node_id] = slots.setdefault(key, len(slots))
+    return shared
+
+
+def _format_tree(tree: ast.AST, shared: Dict[int, int]) -> str:
+    """Indented debug view of an optimized tree; [#k] marks memoised sub-trees."""
+    lines: List[str] = []
+    seen = set()
+
+    def label(n: ast.AST) -> str:
+        if isinstance(n, ast.Constant):
+            return repr(n.value)
+        if isinstance(n, ast.Name):
+            return n.id
+        if isinstance(n, ast.Attribute):
+            return ast.unparse(n) if hasattr(ast, "unparse") else n.attr
+        if isinstance(n, (ast.BinOp, ast.UnaryOp, ast.BoolOp)):
+            return type(n.op).__name__
+        if isinstance(n, ast.Compare):
+            return "Compare " + " ".join(type(o).__name__ for o in n.ops)
+        if isinstance(n, ast.Call):
+            name = n.func.id if isinstance(n.func, ast.Name) else "?"
+            return f"{name}()" + (" lazy" if "lazy" in _FUNCTIONS.get(name, {}) else "")
+        return type(n).__name__
+
+    def walk(n: ast.AST, depth: int) -> None:
+        prefix = "  " * depth
+        slot = shared.get(id(n))
+        if slot is not None:
+            if slot in seen:
+                lines.append(f"{prefix}[#{slot}] (reused)")
+                return
+            seen.add(slot)
+            lines.append(f"{prefix}[#{slot}] {label(n)}")
+        else:
+            lines.append(f"{prefix}{label(n)}")
+        if isinstance(n, ast.Attribute):
+            return
+        children = n.args if isinstance(n, ast.Call) else list(ast.iter_child_nodes(n))
+        for child in children:
+            if isinstance(child, (ast.operator, ast.unaryop, ast.boolop, ast.cmpop, ast.expr_context)):
+                continue
+            walk(child, depth + 1)
+
+    walk(tree, 0)
+    return "\n".join(lines)
+
+
+# ---- compiler: AST -> tree of pre-bound closures ----
+# Each compiled node is a callable taking an _EvalContext. Structural errors
+# (unknown functions, bad arity, unsupported syntax) are bound into closures that
+# raise when reached, so error types/messages and their ordering match the
+# original tree-walking interpreter exactly.
+
+
+class _EvalContext:
+    __slots__ = ("node", "lookup", "prompt", "extra_pnginfo", "memo", "rng", "ops")
+
+    def __init__(self, node, lookup: Dict[str, Any], prompt, extra_pnginfo, rng=random):
+        self.node = node
+        self.lookup = lookup
+        self.prompt = prompt
+        self.extra_pnginfo = extra_pnginfo
+        self.memo: Dict[int, Any] = {}
+        self.rng = rng
+        self.ops = 0  # operations actually executed (cost report)
+
+
+def _raiser(exc_type, message: str) -> Callable[[_EvalContext], Any]:
+    def fail(ctx):
+        raise exc_type(message)
+
+    return fail
+
+
+class _Compiler:
+    # hooks overridden by _VectorCompiler
+    operators = _OPERATORS
+    functions = _FUNCTIONS
+    as_number = staticmethod(_as_number)
+
+    @staticmethod
+    def accepts(val) -> bool:
+        return isinstance(val, (int, float, bool, complex))
+
+    def __init__(self, shared: Optional[Dict[int, int]] = None) -> None:
+        self.errors: List[Exception] = []
+        self.shared = shared or {}
+        self._slot_fns: Dict[int, Callable[[_EvalContext], Any]] = {}
+
+    def fail(self, exc_type, message: str):
+        self.errors.append(exc_type(message))
+        return _raiser(exc_type, message)
+
+    def compile(self, n: ast.AST) -> Callable[[_EvalContext], Any]:
+        slot = self.shared.get(id(n))
+        if slot is not None and slot in self._slot_fns:
+            return self._slot_fns[slot]
+        method = getattr(self, f"_c_{type(n).__name__}", None)
+        if method is None:
+            return self.fail(TypeError, f"Unsupported expression node: {type(n).__name__}")
+        fn = method(n)
+        if slot is None:
+            return fn
+
+        def memoised(ctx, fn=fn, slot=slot):
+            memo = ctx.memo
+            if slot in memo:
+                return memo[slot]
+            value = memo[slot] = fn(ctx)
+            return value
+
+        self._slot_fns[slot] = memoised
+        return memoised
+
+    def _c_Constant(self, n: ast.Constant):
+        value = n.value
+        return lambda ctx: value
+
+    def _c_Num(self, n):  # py<3.8 compat
+        value = n.n
+        return lambda ctx: value
+
+    def _c_BinOp(self, n: ast.BinOp):
+        left = self.compile(n.left)
+        right = self.compile(n.right)
+        fn = self.operators.get(type(n.op))
+        num = self.as_number
+        if fn is None:
+            op_type = type(n.op)
+            self.errors.append(KeyError(op_type))
+
+            def binop(ctx):
+                ctx.ops += 1
+                num(left(ctx))
+                num(right(ctx))
+                raise KeyError(op_type)
+
+            return binop
+
+        def binop(ctx):
+            ctx.ops += 1
+            return fn(num(left(ctx)), num(right(ctx)))
+
+        return binop
+
+    def _c_UnaryOp(self, n: ast.UnaryOp):
+        operand = self.compile(n.operand)
+        fn = self.operators.get(type(n.op))
+        num = self.as_number
+        if fn is None:
+            message = f"Unsupported unary op: {type(n.op).__name__}"
+            self.errors.append(TypeError(message))
+
+            def unary(ctx):
+                ctx.ops += 1
+                operand(ctx)
+                raise TypeError(message)
+
+            return unary
+
+        def unary(ctx):
+            ctx.ops += 1
+            return fn(num(operand(ctx)))
+
+        return unary
+
+    def _c_BoolOp(self, n: ast.BoolOp):
+        fn = _OPERATORS.get(type(n.op))
+        if fn is None:
+            return self.fail(TypeError, f"Unsupported bool op: {type(n.op).__name__}")
+        values = tuple(self.compile(v) for v in n.values)
+        # short-circuit: And stops at the first falsy operand, Or at the first truthy
+        stop = isinstance(n.op, ast.Or)
+
+        def boolop(ctx):
+            ctx.ops += 1
+            for v in values:
+                if bool(v(ctx)) is stop:
+                    return 1 if stop else 0
+            return 0 if stop else 1
+
+        return boolop
+
+    def _c_Compare(self, n: ast.Compare):
+        left = self.compile(n.left)
+        steps = []
+        for op_node, comp in zip(n.ops, n.comparators):
+            cmp = _COMPARE_OPS.get(type(op_node))
+            if cmp is None:
+                self.errors.append(NotImplementedError("Unsupported compare operator."))
+            steps.append((cmp, self.compile(comp)))
+        steps = tuple(steps)
+
+        def compare(ctx):
+            ctx.ops += 1
+            lv = left(ctx)
+            for cmp, comp in steps:
+                rv = comp(ctx)
+                if cmp is None:
+                    raise NotImplementedError("Unsupported compare operator.")
+                if not cmp(lv, rv):
+                    return 0
+                lv = rv
+            return 1
+
+        return compare
+
+    def _c_Name(self, n: ast.Name):
+        name = n.id
+        accepts = self.accepts
+
+        def load(ctx):
+            lookup = ctx.lookup
+            if name in lookup:
+                val = lookup[name]
+                if accepts(val):
+                    return val
+                raise TypeError(f"Complex types need .width/.height, e.g. {name}.width")
+            raise NameError(f"Name not found: {name}")
+
+        return load
+
+    def compile_raw(self, n: ast.Name):
+        # bare input for "tensor" functions: no numeric check
+        name = n.id
+
+        def load_raw(ctx):
+            if name in ctx.lookup:
+                return ctx.lookup[name]
+            raise NameError(f"Name not found: {name}")
+
+        return load_raw
+
+    def _c_Attribute(self, n: ast.Attribute):
+        # a.width / a.height / a.batch ... OR NodeName.WidgetName
+        if not isinstance(n.value, ast.Name):
+            return self.fail(TypeError, "Unsupported attribute base.")
+        base = n.value.id
+        attr = n.attr
+
+        if attr in _SIZE_ATTRS:
+
+            def attribute(ctx):
+                ctx.ops += 1
+                if base in ctx.lookup:
+                    return ctx.node.get_size(ctx.lookup[base], attr)
+                return ctx.node.get_widget_value(ctx.extra_pnginfo or {}, ctx.prompt, base, attr)
+
+            return attribute
+
+        def widget(ctx):
+            ctx.ops += 1
+            return ctx.node.get_widget_value(ctx.extra_pnginfo or {}, ctx.prompt, base, attr)
+
+        return widget
+
+    def _c_Call(self, n: ast.Call):
+        if not isinstance(n.func, ast.Name):
+            return self.fail(NameError, "Invalid function call.")
+        fname = n.func.id
+        if fname not in _FUNCTIONS:
+            return self.fail(NameError, f"Invalid function call: {fname}")
+
+        fn = _FUNCTIONS[fname]
+        argc = len(n.args)
+        min_args, max_args = fn["args"]
+        if argc < min_args or (max_args is not None and argc > max_args):
+            to_err = " or more" if max_args is None else f" to {max_args}"
+            return self.fail(SyntaxError, f"Invalid function call: {fname} requires {min_args}{to_err} arguments")
+
+        raw = fn.get("tensor", False)
+        fn = self.functions.get(fname, fn)
+        args = tuple(
+            self.compile_raw(arg) if raw and isinstance(arg, ast.Name) else self.compile(arg) for arg in n.args
+        )
+        if "lazy" in fn:
+            lazy = fn["lazy"]
+
+            def invoke_lazy(ctx):
+                ctx.ops += 1
+                return lazy(*[(lambda arg=arg: arg(ctx)) for arg in args])
+
+            return invoke_lazy
+
+        call = fn["call"]
+        if _FUNCTIONS[fname].get("random"):
+
+            def invoke_random(ctx):
+                ctx.ops += 1
+                return call(*[arg(ctx) for arg in args], rng=ctx.rng)
+
+            return invoke_random
+
+        def invoke(ctx):
+            ctx.ops += 1
+            return call(*[arg(ctx) for arg in args])
+
+        return invoke
+
+
+# ---- vectorized evaluation over torch tensors / NumPy arrays ----
+# Backends are detected from the values themselves, so neither library is ever
+# imported here unless the caller already handed us one of its arrays.
+
+
+def _xp(x):
+    """Array module (torch / numpy) owning x, or None for anything else."""
+    mod = type(x).__module__.partition(".")[0]
+    if mod in ("torch", "numpy") and hasattr(x, "shape") and hasattr(x, "dtype"):
+        return sys.modules.get(mod)
+    return None
+
+
+def _first_array(values):
+    for v in values:
+        if _xp(v) is not None:
+            return v
+    return None
+
+
+def _to_array(x, like):
+    xp = _xp(like)
+    if _xp(x) is xp:
+        return x
+    if xp.__name__ == "torch":
+        return xp.as_tensor(x, device=like.device)
+    return xp.asarray(x)
+
+
+def _is_float_array(x) -> bool:
+    dtype = x.dtype
+    return bool(getattr(dtype, "is_floating_point", False) or getattr(dtype, "kind", "") == "f")
+
+
+def _to_int64(x):
+    xp = _xp(x)
+    if xp.__name__ == "torch":
+        return x.to(xp.int64)
+    return x.astype(xp.int64)
+
+
+def _truthy(x):
+    # elementwise truth as a bool array; scalars keep Python truthiness
+    return (x != 0) if _xp(x) is not None else bool(x)
+
+
+def _as_vector_number(x):
+    xp = _xp(x)
+    if xp is None:
+        return _as_number(x)
+    if str(x.dtype) in ("bool", "torch.bool"):
+        return _to_int64(x)
+    return x
+
+
+def _v_round(a, b=None):
+    xp = _xp(a)
+    if xp is None:
+        return round(a, b)
+    if b is None:
+        return _to_int64(xp.round(a)) if _is_float_array(a) else a
+    return xp.round(a, decimals=int(b))
+
+
+def _v_rounding(name: str, to_int: bool):
+    scalar = {"ceil": math.ceil, "floor": math.floor, "int": int, "sqrt": math.sqrt}[name]
+    array_fn = {"ceil": "ceil", "floor": "floor", "int": "trunc", "sqrt": "sqrt"}[name]
+
+    def call(a):
+        xp = _xp(a)
+        if xp is None:
+            return scalar(a)
+        if to_int and not _is_float_array(a):
+            return a
+        r = getattr(xp, array_fn)(a)
+        return _to_int64(r) if to_int else r
+
+    return call
+
+
+def _v_extreme(reduce: str):
+    scalar = min if reduce == "minimum" else max
+    single = _reduction("min" if reduce == "minimum" else "max")
+
+    def call(*args):
+        if len(args) == 1:
+            return single(*args)
+        like = _first_array(args)
+        if like is None:
+            return scalar(*args)
+        xp = _xp(like)
+        acc = _to_array(args[0], like)
+        for x in args[1:]:
+            acc = getattr(xp, reduce)(acc, _to_array(x, like))
+        return acc
+
+    return call
+
+
+def _array_rng(rng, like):
+    """Backend generator for like's device; seeded from rng unless rng is the global random module."""
+    xp = _xp(like)
+    seed = None if rng is random else rng.getrandbits(63)
+    if xp.__name__ == "numpy":
+        return xp.random.default_rng(seed)
+    if seed is None:
+        return None
+    return xp.Generator(device=like.device).manual_seed(seed)
+
+
+def _v_randomint(a, b, rng=random):
+    like = _first_array((a, b))
+    if like is None:
+        return rng.randint(a, b)
+    xp = _xp(like)
+    gen = _array_rng(rng, like)
+    lo, hi = _to_array(a, like), _to_array(b, like)
+    if xp.__name__ == "numpy":
+        return gen.integers(lo, hi + 1)
+    lo, hi = xp.broadcast_tensors(lo, hi)
+    u = xp.rand(lo.shape, device=like.device, generator=gen)
+    return _to_int64(lo + xp.floor(u * (hi - lo + 1)))
+
+
+def _v_randomchoice(*args, rng=random):
+    like = _first_array(args)
+    if like is None:
+        return rng.choice(args)
+    xp = _xp(like)
+    gen = _array_rng(rng, like)
+    arrays = [_to_array(x, like) for x in args]
+    if xp.__name__ == "numpy":
+        arrays = xp.broadcast_arrays(*arrays)
+        return xp.choose(gen.integers(0, len(arrays), size=arrays[0].shape), arrays)
+    stacked = xp.stack(xp.broadcast_tensors(*arrays))
+    idx = xp.randint(0, len(arrays), stacked.shape[1:], device=like.device, generator=gen)
+    return stacked.gather(0, idx.unsqueeze(0)).squeeze(0)
+
+
+def _first_item(values):
+    """Scalar view of a vectorized result: its first element (only that element is synced)."""
+    if _xp(values) is not None:
+        flat = values.reshape(-1)
+        return flat[0].item() if flat.shape[0] else 0
+    if isinstance(values, list):
+        return values[0] if values else 0
+    return values
+
+
+def _v_iif(a, b, c):
+    cond = a()
+    if _xp(cond) is None:
+        return b() if cond else c()
+    tv, fv = b(), c()
+    xp = _xp(cond)
+    if xp.__name__ == "torch":
+        tv, fv = _to_array(tv, cond), _to_array(fv, cond)
+    return xp.where(cond != 0, tv, fv)
+
+
+_VECTOR_OPERATORS = dict(_OPERATORS)
+_VECTOR_OPERATORS[ast.Not] = lambda a: _to_int64(a == 0) if _xp(a) is not None else (0 if a else 1)
+
+_VECTOR_FUNCTIONS: Dict[str, Dict[str, Any]] = {
+    "round": {"call": _v_round},
+    "ceil": {"call": _v_rounding("ceil", True)},
+    "floor": {"call": _v_rounding("floor", True)},
+    "int": {"call": _v_rounding("int", True)},
+    "sqrt": {"call": _v_rounding("sqrt", False)},
+    "min": {"call": _v_extreme("minimum")},
+    "max": {"call": _v_extreme("maximum")},
+    "randomint": {"call": _v_randomint},
+    "randomchoice": {"call": _v_randomchoice},
+    "iif": {"lazy": _v_iif},
+}
+
+
+class _VectorCompiler(_Compiler):
+    """Compiles the same optimized tree for tensor/ndarray operands (broadcast on their own device)."""
+
+    operators = _VECTOR_OPERATORS
+    functions = _VECTOR_FUNCTIONS
+    as_number = staticmethod(_as_vector_number)
+
+    @staticmethod
+    def accepts(val) -> bool:
+        return isinstance(val, (int, float, bool, complex)) or _xp(val) is not None
+
+    def _c_BoolOp(self, n: ast.BoolOp):
+        if type(n.op) not in self.operators:
+            return super()._c_BoolOp(n)
+        values = tuple(self.compile(v) for v in n.values)
+        stop = isinstance(n.op, ast.Or)
+
+        def boolop(ctx):
+            ctx.ops += 1
+            acc = None
+            for v in values:
+                t = _truthy(v(ctx))
+                if isinstance(t, bool):
+                    # a scalar operand decides the whole result for every element
+                    if t is stop:
+                        return 1 if stop else 0
+                    continue
+                acc = t if acc is None else ((acc | t) if stop else (acc & t))
+            if acc is None:
+                return 0 if stop else 1
+            return _to_int64(acc)
+
+        return boolop
+
+    def _c_Compare(self, n: ast.Compare):
+        left = self.compile(n.left)
+        steps = []
+        for op_node, comp in zip(n.ops, n.comparators):
+            cmp = _COMPARE_OPS.get(type(op_node))
+            if cmp is None:
+                self.errors.append(NotImplementedError("Unsupported compare operator."))
+            steps.append((cmp, self.compile(comp)))
+        steps = tuple(steps)
+
+        def compare(ctx):
+            ctx.ops += 1
+            lv = left(ctx)
+            acc = None
+            for cmp, comp in steps:
+                rv = comp(ctx)
+                if cmp is None:
+                    raise NotImplementedError("Unsupported compare operator.")
+                ok = cmp(lv, rv)
+                if _xp(ok) is None:
+                    if not ok:
+                        return 0
+                else:
+                    acc = ok if acc is None else (acc & ok)
+                lv = rv
+            return 1 if acc is None else _to_int64(acc)
+
+        return compare
+
+
+def _measure(tree: ast.AST) -> Tuple[int, int]:
+    """(node count, nesting depth) of an expression tree, without recursion."""
+    size = depth = 0
+    stack = [(tree, 1)]
+    while stack:
+        n, d = stack.pop()
+        size += 1
+        depth = max(depth, d)
+        stack.extend((child, d + 1) for child in ast.iter_child_nodes(n) if isinstance(child, ast.expr))
+    return size, depth
+
+
+class _CompiledExpression:
+    """An expression parsed and compiled once; call with an _EvalContext."""
+
+    __slots__ = (
+        "source",
+        "tree",
+        "shared",
+        "fn",
+        "errors",
+        "names",
+        "widget_refs",
+        "random",
+        "size",
+        "depth",
+        "_vector_fn",
+    )
+
+    def __init__(self, source: str):
+        self.source = source
+        try:
+            tree = ast.parse(source, mode="eval")
+        except (RecursionError, MemoryError):
+            # CPython's own parser gives up on very deep input before our caps can measure it
+            raise ValueError(f"Expression too large to parse (limits: {_MAX_NODES} nodes, depth {_MAX_DEPTH})") from None
+        self.size, self.depth = _measure(tree.body)
+        if self.size > _MAX_NODES:
+            raise ValueError(f"Expression too large: {self.size} nodes (limit {_MAX_NODES})")
+        if self.depth > _MAX_DEPTH:
+            raise ValueError(f"Expression nested too deeply: depth {self.depth} (limit {_MAX_DEPTH})")
+        self.tree = _Optimizer().visit(tree).body
+        self.shared = _shared_subtrees(self.tree)
+        compiler = _Compiler(self.shared)
+        self.fn = compiler.compile(self.tree)
+        self.errors = tuple(compiler.errors)
+        self._vector_fn = None
+
+        # dependency set of the optimized tree (dead constant branches are already gone)
+        refs = []
+        names = []
+        not_variables = set()  # function names and attribute bases
+        self.random = False
+        for n in ast.walk(self.tree):  # breadth-first: parents before children
+            if isinstance(n, ast.Attribute) and isinstance(n.value, ast.Name):
+                not_variables.add(id(n.value))
+                if (n.value.id, n.attr) not in refs:
+                    refs.append((n.value.id, n.attr))
+            elif isinstance(n, ast.Call):
+                not_variables.add(id(n.func))
+                self.random = self.random or _is_random_call(n)
+            elif isinstance(n, ast.Name) and id(n) not in not_variables and n.id not in names:
+                names.append(n.id)
+        self.names = tuple(names)
+        self.widget_refs = tuple(refs)
+
+    def __call__(self, ctx: _EvalContext):
+        return self.fn(ctx)
+
+    @property
+    def vector_fn(self) -> Callable[[_EvalContext], Any]:
+        # built on first vectorized use; a benign race just compiles twice
+        if self._vector_fn is None:
+            self._vector_fn = _VectorCompiler(self.shared).compile(self.tree)
+        return self._vector_fn
+
+    def explain(self) -> str:
+        return _format_tree(self.tree, self.shared)
+
+    def cost(self, ops: int) -> str:
+        return f"cost: {ops} ops ({self.size} nodes, depth {self.depth})"
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class _ExpressionCache:
+    """Bounded, thread-safe LRU of compiled expressions shared by all Math_AS instances."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[str, _CompiledExpression]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, expression: str) -> _CompiledExpression:
+        key = _normalize_expression(expression)
+        with self._lock:
+            compiled = self._data.get(key)
+            if compiled is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        # compile outside the lock; SyntaxError propagates and nothing is cached
+        compiled = _CompiledExpression(key)
+        with self._lock:
+            self._data[key] = compiled
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return compiled
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_EXPRESSION_CACHE = _ExpressionCache()
+
+
+def expression_cache_info() -> CacheInfo:
+    """Hit/miss counters of the shared compiled-expression cache."""
+    return _EXPRESSION_CACHE.info()
+
+
+def expression_cache_clear() -> None:
+    _EXPRESSION_CACHE.clear()
+
+
+def explain_expression(expression: str) -> str:
+    """Debug view of the optimized tree Math_AS actually evaluates."""
+    return _EXPRESSION_CACHE.get(expression).explain()
+
+
+# ---- widget references: per-prompt index ----
+
+
+class _PromptIndex:
+    """
+    NodeName -> prompt entry lookup for one prompt, built once and shared by every
+    Math_AS node of that run.
+    - workflow S&R names and titles first (same precedence as the old linear scan)
+    - then API-prompt class_type / _meta.title, then ids ("12" or "_12")
+    """
+
+    __slots__ = ("prompt", "workflow", "names")
+
+    def __init__(self, prompt, workflow):
+        self.prompt = prompt
+        self.workflow = workflow
+        names: Dict[Any, str] = {}
+
+        for node in workflow.get("nodes", []):
+            node_id = str(node.get("id"))
+            name = node.get("type")
+            props = node.get("properties") or {}
+            if "Node name for S&R" in props:
+                name = props["Node name for S&R"]
+            names.setdefault(name, node_id)
+            title = node.get("title")
+            if title is not None:
+                names.setdefault(title, node_id)
+
+        for node_id, entry in prompt.items():
+            if not isinstance(entry, dict):
+                continue
+            names.setdefault(entry.get("class_type"), node_id)
+            title = (entry.get("_meta") or {}).get("title")
+            if title is not None:
+                names.setdefault(title, node_id)
+        for node_id in prompt.keys():
+            names.setdefault(str(node_id), str(node_id))
+            names.setdefault(f"_{node_id}", str(node_id))
+
+        names.pop(None, None)
+        self.names = names
+
+    def inputs(self, node_id: str) -> Dict[str, Any]:
+        return (self.prompt.get(node_id) or {}).get("inputs", {})
+
+    def resolve_link(self, link: list):
+        """
+        Value of a converted widget when it is fed by a literal primitive node
+        (PrimitiveInt/Float/String/Boolean ...), which holds the value as an input.
+        Anything else is only known at run time, in no guaranteed order, so it is refused.
+        """
+        entry = self.prompt.get(str(link[0])) or {}
+        if str(entry.get("class_type", "")).startswith("Primitive"):
+            value = entry.get("inputs", {}).get("value")
+            if value is not None and not isinstance(value, list):
+                return value
+        raise ValueError("Converted widgets not supported via named reference; use inputs instead.")
+
+
+_PROMPT_INDEXES: "OrderedDict[tuple, _PromptIndex]" = OrderedDict()
+_PROMPT_INDEX_LOCK = threading.Lock()
+_PROMPT_INDEX_SLOTS = 4
+
+
+def _prompt_index(prompt, extra_pnginfo) -> _PromptIndex:
+    """
+    Index for (prompt, workflow), reused for the whole run. Plain dicts cannot be
+    weak-referenced, so entries are held for the last few prompts and matched by
+    identity, which also keeps the ids from being recycled while cached.
+    """
+    prompt = prompt if isinstance(prompt, dict) else {}
+    workflow = extra_pnginfo["workflow"] if isinstance(extra_pnginfo, dict) and "workflow" in extra_pnginfo else {"nodes": []}
+    key = (id(prompt), id(workflow))
+    with _PROMPT_INDEX_LOCK:
+        index = _PROMPT_INDEXES.get(key)
+        if index is not None and index.prompt is prompt and index.workflow is workflow:
+            _PROMPT_INDEXES.move_to_end(key)
+            return index
+
+    index = _PromptIndex(prompt, workflow)
+    with _PROMPT_INDEX_LOCK:
+        index = _PROMPT_INDEXES.setdefault(key, index)
+        while len(_PROMPT_INDEXES) > _PROMPT_INDEX_SLOTS:
+            _PROMPT_INDEXES.popitem(last=False)
+    return index
+
+
+def _seeded_rng(seed):
+    return random.Random(int(seed)) if seed is not None and int(seed) >= 0 else random
+
+
+def _dependency_key(compiled_exprs, seed):
+    """
+    IS_CHANGED value from the compiled expressions: always changed for unseeded random
+    calls, otherwise the expression text (and seed when random is seeded).
+    NodeName.widget references are not part of the key: ComfyUI hands IS_CHANGED an
+    empty prompt, so a changed referenced widget alone does not re-run the node.
+    """
+    seeded = seed is not None and int(seed) >= 0
+    has_random = any(c.random for c in compiled_exprs)
+    if has_random and not seeded:
+        return float("nan")
+    return repr((tuple(c.source for c in compiled_exprs), seed if has_random else None))
+
+
+def _validation_error(compiled: _CompiledExpression, local_names) -> Optional[str]:
+    """
+    First problem evaluate() would hit regardless of input values, or None.
+    NodeName.widget references are only checked at run time: VALIDATE_INPUTS gets no prompt.
+    """
+    if compiled.errors:
+        e = compiled.errors[0]
+        return f"{type(e).__name__}: {e}"
+    for name in compiled.names:
+        if name not in local_names:
+            return f"NameError: Name not found: {name}"
+    return None
+
 
 class Math_AS:
     @classmethod
@@ -75,6 +1159,12 @@ class Math_AS:
                 "a": (WILDCARD,),
                 "b": (WILDCARD,),
                 "c": (WILDCARD,),
+                "debug": ("BOOLEAN", {"default": False, "tooltip": "show the optimized expression tree"}),
+                "vectorize": (
+                    "BOOLEAN",
+                    {"default": False, "tooltip": "broadcast over list/tensor/ndarray inputs; result on 'values'"},
+                ),
+                "seed": seedInput,
             },
             "hidden": {
                 "extra_pnginfo": "EXTRA_PNGINFO",
@@ -82,172 +1172,390 @@ class Math_AS:
             },
         }
 
-    RETURN_TYPES = ("INT", "FLOAT")
+    RETURN_TYPES = ("INT", "FLOAT", WILDCARD)
+    RETURN_NAMES = ("INT", "FLOAT", "values")
     FUNCTION = "evaluate"
     CATEGORY = "AgaveSunset/AS"
     OUTPUT_NODE = True
 
     @classmethod
-    def IS_CHANGED(cls, expression: str, **kwargs):
-        # if expression includes random, treat as always changed
-        if "random" in (expression or ""):
-            return float("nan")
-        return expression
+    def IS_CHANGED(cls, expression: str, seed=-1, **kwargs):
+        try:
+            compiled = _EXPRESSION_CACHE.get(expression)
+        except (SyntaxError, ValueError):
+            return expression  # evaluate() / sweep() report it
+        return _dependency_key([compiled], seed)
+
+    @classmethod
+    def VALIDATE_INPUTS(cls, expression=None):
+        """
+        Rejects bad expressions at prompt validation, before any upstream work runs:
+        syntax, size budget, allowed node types, function arity and unknown names
+        (NodeName.widget references are resolved, and checked, at run time).
+        Also warms the compiled-expression cache for execution.
+        """
+        if expression is None:  # linked input; checked at run time
+            return True
+        try:
+            compiled = _EXPRESSION_CACHE.get(expression)
+        except (SyntaxError, ValueError) as e:
+            return f"[Math_AS] {type(e).__name__}: {e}"
+        err = _validation_error(compiled, _INPUT_NAMES)
+        return f"[Math_AS] {err}" if err else True
 
     # ---- helpers ----
     def get_widget_value(self, extra_pnginfo, prompt, node_name: str, widget_name: str):
-        workflow = extra_pnginfo["workflow"] if isinstance(extra_pnginfo, dict) and "workflow" in extra_pnginfo else {"nodes": []}
-        node_id = None
-
-        for node in workflow.get("nodes", []):
-            name = node.get("type")
-
-            props = node.get("properties") or {}
-            if "Node name for S&R" in props:
-                name = props["Node name for S&R"]
-
-            if name == node_name:
-                node_id = node.get("id")
-                break
-
-            title = node.get("title")
-            if title == node_name:
-                node_id = node.get("id")
-                break
-
+        index = _prompt_index(prompt, extra_pnginfo)
+        node_id = index.names.get(node_name)
         if node_id is None:
             raise NameError(f"Node not found: {node_name}.{widget_name}")
 
-        values = prompt.get(str(node_id), {})
-        inputs = values.get("inputs", {})
+        inputs = index.inputs(node_id)
         if widget_name not in inputs:
             raise NameError(f"Widget not found: {node_name}.{widget_name}")
 
         value = inputs[widget_name]
         if isinstance(value, list):
-            raise ValueError("Converted widgets not supported via named reference; use inputs instead.")
+            return index.resolve_link(value)
         return value
 
     def get_size(self, target, prop: str):
-        # latent dict: {"samples": tensor[B,C,H,W]} -> width/height = W*8 / H*8
+        """
+        Metadata probe (width/height/batch/channels/frames/nbytes); reads shape/dtype only.
+        - latent dict: samples [B,C,H,W] or video [B,C,T,H,W]; width/height = W*8 / H*8
+        - image tensor: [B,H,W,C]
+        - mask tensor: [B,H,W] or [H,W]
+        """
+        if prop == "nbytes":
+            t = _tensor_data(target)
+            nbytes = getattr(t, "nbytes", None)
+            if isinstance(nbytes, int):
+                return nbytes
+            return t.numel() * t.element_size()
+
         if isinstance(target, dict) and "samples" in target:
-            samples = target["samples"]
-            return samples.shape[3] * 8 if prop == "width" else samples.shape[2] * 8
-        # image tensor: [B,H,W,C] or similar
-        return target.shape[2] if prop == "width" else target.shape[1]
+            shape = target["samples"].shape
+            frames = shape[2] if len(shape) == 5 else shape[0]
+            meta = {"width": shape[-1] * 8, "height": shape[-2] * 8, "batch": shape[0], "channels": shape[1]}
+            meta["frames"] = frames
+            return meta[prop]
+
+        shape = target.shape
+        if len(shape) == 4:  # image
+            meta = {"width": shape[2], "height": shape[1], "batch": shape[0], "channels": shape[3], "frames": shape[0]}
+            return meta[prop]
+        # mask or similar
+        batch = shape[0] if len(shape) >= 3 else 1
+        return {"width": shape[-1], "height": shape[-2], "batch": batch, "channels": 1, "frames": batch}[prop]
 
     # ---- evaluator ----
-    def evaluate(self, expression: str, prompt, extra_pnginfo=None, a=None, b=None, c=None):
-        expr = (expression or "").replace("\n", " ").replace("\r", "")
-        node = ast.parse(expr, mode="eval").body
+    def evaluate_vector(
+        self, compiled: _CompiledExpression, lookup: Dict[str, Any], prompt, extra_pnginfo, rng=random
+    ):
+        """
+        Evaluate once over every item of the list/tensor/ndarray inputs; returns (values, ops).
+        - any tensor/ndarray: one broadcast pass on its device; lists are converted alongside
+        - only lists: per-item loop over the compiled form (length-1 lists broadcast)
+        """
+        like = _first_array(lookup.values())
+        if like is not None:
+            vec = {k: (_to_array(v, like) if isinstance(v, (list, tuple)) else v) for k, v in lookup.items()}
+            ctx = _EvalContext(self, vec, prompt, extra_pnginfo, rng)
+            return compiled.vector_fn(ctx), ctx.ops
+
+        lengths = {len(v) for v in lookup.values() if isinstance(v, (list, tuple))}
+        if not lengths:
+            ctx = _EvalContext(self, lookup, prompt, extra_pnginfo, rng)
+            return compiled(ctx), ctx.ops
+        n = max(lengths)
+        if lengths - {1, n}:
+            raise ValueError(f"Vectorized list inputs must have matching lengths, got {sorted(lengths)}")
+
+        out = []
+        ops = 0
+        for i in range(n):
+            item = {
+                k: (v[i if len(v) > 1 else 0] if isinstance(v, (list, tuple)) else v) for k, v in lookup.items()
+            }
+            ctx = _EvalContext(self, item, prompt, extra_pnginfo, rng)
+            out.append(compiled(ctx))
+            ops += ctx.ops
+        return out, ops
+
+    def evaluate(
+        self,
+        expression: str,
+        prompt,
+        extra_pnginfo=None,
+        a=None,
+        b=None,
+        c=None,
+        debug=False,
+        vectorize=False,
+        seed=-1,
+    ):
+        compiled = _EXPRESSION_CACHE.get(expression)
         lookup = {"a": a, "b": b, "c": c}
+        rng = _seeded_rng(seed)
+        if vectorize:
+            values, ops = self.evaluate_vector(compiled, lookup, prompt, extra_pnginfo, rng)
+            r = _first_item(values)
+        else:
+            ctx = _EvalContext(self, lookup, prompt, extra_pnginfo, rng)
+            r = values = compiled(ctx)
+            ops = ctx.ops
+        result = _int_float(r) + (values,)
 
-        def as_number(x):
-            if isinstance(x, bool):
-                return int(x)
-            if isinstance(x, int):
-                return x
-            return float(x)
-
-        def eval_expr(n):
-            # constants
-            if isinstance(n, ast.Constant):
-                return n.value
-            if isinstance(n, ast.Num):  # py<3.8 compat
-                return n.n
-
-            # binary ops
-            if isinstance(n, ast.BinOp):
-                l = as_number(eval_expr(n.left))
-                r = as_number(eval_expr(n.right))
-                return _OPERATORS[type(n.op)](l, r)
-
-            # unary ops
-            if isinstance(n, ast.UnaryOp):
-                v = eval_expr(n.operand)
-                fn = _OPERATORS.get(type(n.op))
-                if fn is None:
-                    raise TypeError(f"Unsupported unary op: {type(n.op).__name__}")
-                return fn(as_number(v))
-
-            # bool ops (And/Or can have >2 values)
-            if isinstance(n, ast.BoolOp):
-                fn = _OPERATORS.get(type(n.op))
-                if fn is None:
-                    raise TypeError(f"Unsupported bool op: {type(n.op).__name__}")
-                v = eval_expr(n.values[0])
-                for nxt in n.values[1:]:
-                    v = fn(v, eval_expr(nxt))
-                return v
-
-            # comparisons (support chained)
-            if isinstance(n, ast.Compare):
-                left = eval_expr(n.left)
-                for op_node, comp in zip(n.ops, n.comparators):
-                    right = eval_expr(comp)
-                    if isinstance(op_node, ast.Eq):
-                        ok = left == right
-                    elif isinstance(op_node, ast.NotEq):
-                        ok = left != right
-                    elif isinstance(op_node, ast.Gt):
-                        ok = left > right
-                    elif isinstance(op_node, ast.GtE):
-                        ok = left >= right
-                    elif isinstance(op_node, ast.Lt):
-                        ok = left < right
-                    elif isinstance(op_node, ast.LtE):
-                        ok = left <= right
-                    else:
-                        raise NotImplementedError("Unsupported compare operator.")
-                    if not ok:
-                        return 0
-                    left = right
-                return 1
-
-            # names
-            if isinstance(n, ast.Name):
-                if n.id in lookup:
-                    val = lookup[n.id]
-                    if isinstance(val, (int, float, bool, complex)):
-                        return val
-                    raise TypeError(f"Complex types need .width/.height, e.g. {n.id}.width")
-                raise NameError(f"Name not found: {n.id}")
-
-            # attribute access: a.width / a.height OR NodeName.WidgetName
-            if isinstance(n, ast.Attribute):
-                if not isinstance(n.value, ast.Name):
-                    raise TypeError("Unsupported attribute base.")
-                base = n.value.id
-                attr = n.attr
-
-                if base in lookup and attr in ("width", "height"):
-                    return self.get_size(lookup[base], attr)
-
-                return self.get_widget_value(extra_pnginfo or {}, prompt, base, attr)
-
-            # function calls
-            if isinstance(n, ast.Call):
-                if not isinstance(n.func, ast.Name):
-                    raise NameError("Invalid function call.")
-                fname = n.func.id
-                if fname not in _FUNCTIONS:
-                    raise NameError(f"Invalid function call: {fname}")
-
-                fn = _FUNCTIONS[fname]
-                argc = len(n.args)
-                min_args, max_args = fn["args"]
-                if argc < min_args or (max_args is not None and argc > max_args):
-                    to_err = " or more" if max_args is None else f" to {max_args}"
-                    raise SyntaxError(f"Invalid function call: {fname} requires {min_args}{to_err} arguments")
-
-                args = [eval_expr(arg) for arg in n.args]
-                return fn["call"](*args)
-
-            raise TypeError(f"Unsupported expression node: {type(n).__name__}")
-
-        r = eval_expr(node)
-        return {"ui": {"value": [r]}, "result": (int(r), float(r))}
-
-
-NODE_CLASS_MAPPINGS = {"MathAgaveSunset": Math_AS}
-NODE_DISPLAY_NAME_MAPPINGS = {"MathAgaveSunset": "Math_AS"}
+        ui = {"value": [r], "cost": [compiled.cost(ops)]}
+        if debug:
+            ui["text"] = [f"{compiled.explain()}\n{compiled.cost(ops)}"]
+        return {"ui": ui, "result": result}
+
+
+_ASSIGNMENT = re.compile(r"^\s*([A-Za-z_]\w*)\s*=(?!=)(.*)$")
+_MULTI_OUTPUTS = 8
+
+
+@lru_cache(maxsize=64)
+def _parse_block(text: str) -> Tuple[Tuple[str, str], ...]:
+    """'name = expression' lines -> ((name, expression), ...); blank lines and # comments are skipped."""
+    lines = []
+    seen = set()
+    for lineno, line in enumerate((text or "").splitlines(), 1):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        m = _ASSIGNMENT.match(line)
+        if m is None:
+            raise SyntaxError(f"Line {lineno}: expected 'name = expression', got {line.strip()!r}")
+        name, expr = m.group(1), m.group(2).strip()
+        if name in _INPUT_NAMES or name in _FUNCTIONS:
+            raise SyntaxError(f"Line {lineno}: {name!r} is reserved")
+        if name in seen:
+            raise SyntaxError(f"Line {lineno}: {name!r} is assigned twice")
+        seen.add(name)
+        lines.append((name, expr))
+    return tuple(lines)
+
+
+class MathMulti_AS(Math_AS):
+    """
+    Evaluates a block of 'name = expression' lines in one execution.
+    - later lines may reference earlier names; a/b/c, functions and NodeName.widget work as in Math_AS
+    - Outputs: results (dict name -> value) and out0..out7 for the first 8 lines
+    """
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "expressions": (
+                    "STRING",
+                    {
+                        "multiline": True,
+                        "dynamicPrompts": False,
+                        "default": "width = a.width\nheight = a.height\nratio = width / height",
+                        "pysssss.autocomplete": {"words": autocompleteWords, "separator": ""},
+                    },
+                )
+            },
+            "optional": {
+                "a": (WILDCARD,),
+                "b": (WILDCARD,),
+                "c": (WILDCARD,),
+                "seed": seedInput,
+            },
+            "hidden": {
+                "extra_pnginfo": "EXTRA_PNGINFO",
+                "prompt": "PROMPT",
+            },
+        }
+
+    RETURN_TYPES = (WILDCARD,) * (_MULTI_OUTPUTS + 1)
+    RETURN_NAMES = ("results",) + tuple(f"out{i}" for i in range(_MULTI_OUTPUTS))
+    FUNCTION = "evaluate_block"
+
+    @staticmethod
+    def _compile_block(expressions: str):
+        return [(name, _EXPRESSION_CACHE.get(expr)) for name, expr in _parse_block(expressions)]
+
+    @classmethod
+    def IS_CHANGED(cls, expressions: str, seed=-1, **kwargs):
+        try:
+            block = cls._compile_block(expressions)
+        except (SyntaxError, ValueError):
+            return expressions  # evaluate_block() reports it
+        return _dependency_key([c for _, c in block], seed)
+
+    @classmethod
+    def VALIDATE_INPUTS(cls, expressions=None):
+        if expressions is None:  # linked input; checked at run time
+            return True
+        try:
+            block = cls._compile_block(expressions)
+        except (SyntaxError, ValueError) as e:
+            return f"[MathMulti_AS] {type(e).__name__}: {e}"
+        local_names = _INPUT_NAMES
+        for name, compiled in block:
+            err = _validation_error(compiled, local_names)
+            if err:
+                return f"[MathMulti_AS] {name}: {err}"
+            local_names += (name,)
+        return True
+
+    def evaluate_block(
+        self, expressions: str, prompt, extra_pnginfo=None, a=None, b=None, c=None, seed=-1
+    ):
+        block = self._compile_block(expressions)
+        lookup = {"a": a, "b": b, "c": c}
+        rng = _seeded_rng(seed)
+        results: Dict[str, Any] = {}
+        ops = 0
+        for name, compiled in block:
+            ctx = _EvalContext(self, lookup, prompt, extra_pnginfo, rng)
+            lookup[name] = results[name] = compiled(ctx)
+            ops += ctx.ops
+
+        values = list(results.values())[:_MULTI_OUTPUTS]
+        result = (results,) + tuple(values) + (None,) * (_MULTI_OUTPUTS - len(values))
+
+        ui_lines = [f"{name} = {value!r}" for name, value in results.items()]
+        ui_lines.append(f"cost: {ops} ops")
+        ui_text = "\n".join(ui_lines)
+        return {"ui": {"text": [ui_text]}, "result": result}
+
+
+_SWEEP_NAMES = _INPUT_NAMES + ("i", "k", "n", "acc")
+_SWEEP_LIMIT = 100_000
+
+
+def _sweep_points(start: float, stop: float, step: float, count: int) -> List[Any]:
+    """count > 0: count evenly spaced points start..stop (inclusive); else range(start, stop, step)."""
+    integral = all(float(x).is_integer() for x in (start, stop, step))
+    if count > 0:
+        if count > _SWEEP_LIMIT:
+            raise ValueError(f"[MathSweep_AS] count {count} exceeds the sweep limit of {_SWEEP_LIMIT}")
+        if count == 1:
+            return [int(start) if integral else start]
+        span = (stop - start) / (count - 1)
+        points = [start + k * span for k in range(count)]
+        return [int(p) for p in points] if integral and float(span).is_integer() else points
+
+    if step == 0:
+        raise ValueError("[MathSweep_AS] step must not be 0 when count is 0")
+    total = max(0, math.ceil((stop - start) / step))
+    if total > _SWEEP_LIMIT:
+        raise ValueError(f"[MathSweep_AS] sweep of {total} points exceeds the limit of {_SWEEP_LIMIT}")
+    if integral:
+        return list(range(int(start), int(stop), int(step)))
+    return [start + k * step for k in range(total)]
+
+
+class MathSweep_AS(Math_AS):
+    """
+    Evaluates one expression over a range in a single execution (schedules, ramps, seed lists).
+    - Variables: i (point), k (0-based index), n (point count), acc (previous result; acc_init first)
+    - Range: count > 0 -> count points start..stop inclusive; count = 0 -> start, start+step, ... < stop
+    - Outputs: INT / FLOAT lists (OUTPUT_IS_LIST) and values as a compact array('d')
+    The expression is compiled once and reused for every point.
+    """
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "expression": (
+                    "STRING",
+                    {
+                        "multiline": True,
+                        "dynamicPrompts": False,
+                        "default": "i",
+                        "pysssss.autocomplete": {"words": autocompleteWords, "separator": ""},
+                    },
+                ),
+                "start": ("FLOAT", {"default": 0.0, "min": -1e9, "max": 1e9, "step": 0.01}),
+                "stop": ("FLOAT", {"default": 10.0, "min": -1e9, "max": 1e9, "step": 0.01}),
+                "step": ("FLOAT", {"default": 1.0, "min": -1e9, "max": 1e9, "step": 0.01}),
+                "count": ("INT", {"default": 0, "min": 0, "max": _SWEEP_LIMIT, "tooltip": "0 = use step"}),
+                "acc_init": ("FLOAT", {"default": 0.0, "min": -1e9, "max": 1e9, "step": 0.01}),
+            },
+            "optional": {
+                "a": (WILDCARD,),
+                "b": (WILDCARD,),
+                "c": (WILDCARD,),
+                "seed": seedInput,
+            },
+            "hidden": {
+                "extra_pnginfo": "EXTRA_PNGINFO",
+                "prompt": "PROMPT",
+            },
+        }
+
+    RETURN_TYPES = ("INT", "FLOAT", WILDCARD)
+    RETURN_NAMES = ("INT", "FLOAT", "values")
+    OUTPUT_IS_LIST = (True, True, False)
+    FUNCTION = "sweep"
+
+    @classmethod
+    def VALIDATE_INPUTS(cls, expression=None):
+        if expression is None:  # linked input; checked at run time
+            return True
+        try:
+            compiled = _EXPRESSION_CACHE.get(expression)
+        except (SyntaxError, ValueError) as e:
+            return f"[MathSweep_AS] {type(e).__name__}: {e}"
+        err = _validation_error(compiled, _SWEEP_NAMES)
+        return f"[MathSweep_AS] {err}" if err else True
+
+    def sweep(
+        self,
+        expression: str,
+        start: float,
+        stop: float,
+        step: float,
+        count: int,
+        acc_init: float,
+        prompt=None,
+        extra_pnginfo=None,
+        a=None,
+        b=None,
+        c=None,
+        seed=-1,
+    ):
+        compiled = _EXPRESSION_CACHE.get(expression)
+        points = _sweep_points(start, stop, step, int(count))
+        acc = int(acc_init) if float(acc_init).is_integer() else acc_init
+        lookup = {"a": a, "b": b, "c": c, "i": 0, "k": 0, "n": len(points), "acc": acc}
+
+        # one context reused for every point; only the per-point memo is reset
+        ctx = _EvalContext(self, lookup, prompt, extra_pnginfo, _seeded_rng(seed))
+        values = array("d")
+        ints: List[int] = []
+        floats: List[float] = []
+        for k, i in enumerate(points):
+            lookup["i"] = i
+            lookup["k"] = k
+            ctx.memo.clear()
+            r = compiled(ctx)
+            lookup["acc"] = r
+            i_r, f_r = _int_float(r)
+            ints.append(i_r)
+            floats.append(f_r)
+            values.append(floats[-1])
+
+        result = (ints, floats, values)
+
+        head = ", ".join(f"{v:g}" for v in floats[:8]) + (", ..." if len(floats) > 8 else "")
+        ui_text = f"{len(floats)} points: [{head}]\n{compiled.cost(ctx.ops)}"
+        return {"ui": {"text": [ui_text]}, "result": result}
+
+
+NODE_CLASS_MAPPINGS = {
+    "MathAgaveSunset": Math_AS,
+    "MathMultiAgaveSunset": MathMulti_AS,
+    "MathSweepAgaveSunset": MathSweep_AS,
+}
+NODE_DISPLAY_NAME_MAPPINGS = {
+    "MathAgaveSunset": "Math_AS",
+    "MathMultiAgaveSunset": "MathMulti_AS",
+    "MathSweepAgaveSunset": "MathSweep_AS",
+}
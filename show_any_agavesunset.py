@@ -21,7 +21,12 @@ class ShowAny_AS:
     - Input: anything(*) [forceInput=True]
     - Output: passthrough(*)
     - UI: returns ui.text for the frontend extension to render
-    - IS_CHANGED: always NaN to force refresh (avoid cache)
+    - refresh:
+        cached  -> IS_CHANGED is constant; the linked input never reaches IS_CHANGED, but the
+                   upstream node's signature is part of this node's cache key, so the node (and
+                   everything after its passthrough) re-runs only when the upstream inputs change.
+                   ComfyUI re-sends the cached text, so the display still updates every run
+        always  -> IS_CHANGED is NaN: re-run every time (disables downstream cache)
     """
 
     CATEGORY = "AgaveSunset/AS"
@@ -37,6 +42,9 @@ class ShowAny_AS:
             "required": {
                 "anything": (WILDCARD, {"forceInput": True}),
             },
+            "optional": {
+                "refresh": (["cached", "always"], {"default": "cached"}),
+            },
             "hidden": {
                 "unique_id": "UNIQUE_ID",
                 "extra_pnginfo": "EXTRA_PNGINFO",
@@ -44,8 +52,8 @@ class ShowAny_AS:
         }
 
     @classmethod
-    def IS_CHANGED(cls, **kwargs):
-        return float("NaN")
+    def IS_CHANGED(cls, refresh: str = "cached", **kwargs):
+        return float("NaN") if refresh == "always" else "cached"
 
     @staticmethod
     def _stringify(v: Any) -> str:
@@ -64,7 +72,7 @@ class ShowAny_AS:
         except Exception as e:
             return f"<unprintable {type(v).__name__}: {e}>"
 
-    def notify(self, anything: Any, unique_id=None, extra_pnginfo=None):
+    def notify(self, anything: Any, refresh: str = "cached", unique_id=None, extra_pnginfo=None):
         text = self._stringify(anything)
 
         # IMPORTANT:
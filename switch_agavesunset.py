@@ -1,7 +1,8 @@
 # file: switch_agavesunset.py
 from __future__ import annotations
 
-from typing import Any, Optional
+import re
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 
 
 class AnyType(str):
@@ -13,19 +14,197 @@ class AnyType(str):
 
 WILDCARD = AnyType("*")
 
+# Try to import ExecutionBlocker (ComfyUI varies by version)
+try:
+    from comfy_execution import graph as graph_module
+
+    ExecutionBlocker = graph_module.ExecutionBlocker
+except Exception:
+    try:
+        from execution import ExecutionBlocker  # older fallback
+    except Exception:
+
+        class ExecutionBlocker:  # type: ignore
+            def __init__(self, message):
+                self.message = message
+
+
+# key routing and the Demux_AS output layout live with Demux_AS
+try:
+    from .demux_agavesunset import _FIXED_OUTPUTS, _SELECTED_INDEX_SLOT, _select_slot
+except ImportError:
+    from demux_agavesunset import _FIXED_OUTPUTS, _SELECTED_INDEX_SLOT, _select_slot
+
+_CASES = tuple(f"case{i}" for i in range(10))
+_CASE_NAME = re.compile(r"case(\d+)")
+_MAX_WAYS = 1024
+
+
+class _OptionalCases(dict):
+    """Optional inputs that also accept case10, case11, ... added by the web extension."""
+
+    def __contains__(self, key: object) -> bool:
+        return dict.__contains__(self, key) or (isinstance(key, str) and _CASE_NAME.fullmatch(key) is not None)
+
+    def __getitem__(self, key: str):
+        if not dict.__contains__(self, key) and isinstance(key, str) and _CASE_NAME.fullmatch(key):
+            return (WILDCARD, {"lazy": True})
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+
+def _case_names(ways: int, names) -> tuple:
+    """case0..case{ways-1}, extended to the highest caseN actually passed in."""
+    top = max([int(m.group(1)) for m in map(_CASE_NAME.fullmatch, names) if m] + [int(ways) - 1])
+    return _CASES if top == 9 else tuple(f"case{i}" for i in range(top + 1))
+
+
+def _is_blocked(v: Any) -> bool:
+    return isinstance(v, ExecutionBlocker) or type(v).__name__ == "ExecutionBlocker"
+
+
+# ---- blocked-branch analysis ----
+# ComfyUI blocks a node as soon as one of its evaluated inputs is an ExecutionBlocker, so the
+# live branch has to be known *before* a case is requested. It is derived from the prompt:
+# a branch is blocked when some upstream path leaves a Demux_AS through a non-selected output.
+# Our own Switch_AS nodes are not walked through: their lazy cases stop a blocker upstream.
+
+_DEMUX_TYPES = ("DemuxAgaveSunset",)
+_LAZY_TYPES = ("SwitchAgaveSunset",)
+
+
+def _is_link(v: Any) -> bool:
+    return isinstance(v, list) and len(v) == 2 and isinstance(v[1], int)
+
+
+def _literal_int(prompt: Dict[str, Any], v: Any) -> Optional[int]:
+    """Widget value, or the value of a Primitive node it is linked to; None if only known at runtime."""
+    if _is_link(v):
+        src = prompt.get(str(v[0]))
+        if isinstance(src, dict) and str(src.get("class_type", "")).startswith("Primitive"):
+            v = src.get("inputs", {}).get("value")
+    if isinstance(v, bool) or not isinstance(v, (int, float)):
+        return None
+    return int(v)
+
+
+def _demux_selection(prompt: Dict[str, Any], inputs: Dict[str, Any]) -> Optional[int]:
+    key, keys = inputs.get("key", ""), inputs.get("keys", "")
+    if _is_link(key) or _is_link(keys) or "scatter" in inputs or "multi_select" in inputs:
+        return None  # only known at runtime
+    select = _literal_int(prompt, inputs.get("select", 0))
+    if isinstance(key, str) and key.strip():
+        return _select_slot(0 if select is None else select, key, keys)
+    return select
+
+
+def _link_blocked(prompt: Dict[str, Any], link: list, memo: Dict[str, bool]) -> bool:
+    src_id, slot = str(link[0]), link[1]
+    src = prompt.get(src_id)
+    if isinstance(src, dict) and src.get("class_type") in _DEMUX_TYPES and not (
+        _SELECTED_INDEX_SLOT <= slot < _FIXED_OUTPUTS
+    ):
+        out = slot if slot < _SELECTED_INDEX_SLOT else slot - _FIXED_OUTPUTS + _SELECTED_INDEX_SLOT
+        select = _demux_selection(prompt, src.get("inputs", {}))
+        if select is not None and select != out:
+            return True
+    return _node_blocked(prompt, src_id, memo)
+
+
+def _node_blocked(prompt: Dict[str, Any], node_id: str, memo: Dict[str, bool]) -> bool:
+    hit = memo.get(node_id)
+    if hit is not None:
+        return hit
+    memo[node_id] = False  # cycle guard
+    node = prompt.get(node_id)
+    blocked = False
+    if isinstance(node, dict) and node.get("class_type") not in _LAZY_TYPES:
+        blocked = any(_is_link(v) and _link_blocked(prompt, v, memo) for v in node.get("inputs", {}).values())
+    memo[node_id] = blocked
+    return blocked
+
+
+def _blocked_inputs(prompt: Any, unique_id: Any) -> FrozenSet[str]:
+    """Names of this node's inputs whose upstream branch is known to be blocked."""
+    if not isinstance(prompt, dict) or unique_id is None:
+        return frozenset()
+    node = prompt.get(str(unique_id))
+    if not isinstance(node, dict):
+        return frozenset()  # e.g. a node created by graph expansion
+
+    memo: Dict[str, bool] = {}  # one walk per call: each upstream node is visited once
+    try:
+        return frozenset(
+            name for name, v in node.get("inputs", {}).items() if _is_link(v) and _link_blocked(prompt, v, memo)
+        )
+    except RecursionError:
+        return frozenset()
+
+
+def _is_tensor(v: Any) -> bool:
+    return type(v).__module__.partition(".")[0] == "torch" and hasattr(v, "index_select")
+
+
+def _index_values(indices: Any, keys: str = "") -> Tuple[Any, List[int]]:
+    """(indices as given or as a flat list, sorted unique values); tensors stay on their device."""
+    if _is_tensor(indices):
+        import torch
+
+        flat = indices.reshape(-1).long()
+        return flat, torch.unique(flat).tolist()
+    if hasattr(indices, "tolist"):  # numpy
+        indices = indices.tolist()
+    if isinstance(indices, (int, float, str)):
+        indices = [indices]
+    flat = [_select_slot(0, i, keys) if isinstance(i, str) else int(i) for i in indices]
+    return flat, sorted(set(flat))
+
+
+def _gather_tensors(idx: Any, sources: Dict[int, Any]) -> Any:
+    """out[i] = sources[idx[i]][i]; one index_select/index_copy_ per source, on the sources' device."""
+    import torch
+
+    first = next(iter(sources.values()))
+    idx = torch.as_tensor(idx, device=first.device).reshape(-1).long()
+    n = idx.shape[0]
+    out = first.new_empty((n,) + tuple(first.shape[1:]))
+    for k, src in sources.items():
+        if tuple(src.shape[1:]) != tuple(first.shape[1:]):
+            raise ValueError(
+                f"[Switch_AS] gather needs matching item shapes, got {tuple(src.shape)} and {tuple(first.shape)}"
+            )
+        if 1 < src.shape[0] < n:
+            raise ValueError(f"[Switch_AS] gather: source batch {src.shape[0]} is smaller than {n} indices")
+        pos = (idx == k).nonzero().squeeze(1)
+        rows = src.expand((n,) + tuple(src.shape[1:])) if src.shape[0] == 1 else src
+        out.index_copy_(0, pos, rows.index_select(0, pos).to(out.dtype))
+    return out
+
 
 class Switch_AS:
     """
     Multi-branch selector (Switch_AS)
 
-    - Optional inputs: case0..case9, default
+    - Optional inputs: case0..case9 (more via ways), default
     - Required:
         index: selects caseN
+        key / keys (optional): select by name; keys lists one name per line (slot = line, or
+            "name = slot"), looked up in a table built once per keys text
         on_miss:
             use_default      -> use default if provided else first_connected else error
             first_connected  -> first connected case0..case9 else default else error
             last_connected   -> last connected case9..case0 else default else error
             error            -> error immediately
+            auto             -> the single connected case that is not blocked (index only breaks ties)
+    - Blocked cases (ExecutionBlocker, or behind a non-selected Demux_AS output) count as missing,
+      so Demux_AS -> branches -> Switch_AS merges back without a second index.
+    - Cases and default are lazy: only the branch chosen by index/on_miss is executed.
+      first/last_connected resolve by connection status, without computing any case.
+    - indices (optional list/tensor): gather mode, item i of the output comes from case indices[i]
+      (missing cases follow on_miss). Tensors/LATENT samples are assembled on their device with
+      index_select; lists pick item i; only the referenced cases are executed.
     """
 
     CATEGORY = "AgaveSunset/AS"
@@ -42,92 +221,159 @@ class Switch_AS:
                     {
                         "default": 0,
                         "min": 0,
-                        "max": 9,  # we only have case0..case9
+                        "max": _MAX_WAYS - 1,  # case10+ are added by the web extension (ways)
                         "step": 1,
                         "display": "number",
                     },
                 ),
-                "on_miss": (["use_default", "first_connected", "last_connected", "error"],),
+                "on_miss": (["use_default", "first_connected", "last_connected", "error", "auto"],),
             },
-            "optional": {
-                "case0": (WILDCARD,),
-                "case1": (WILDCARD,),
-                "case2": (WILDCARD,),
-                "case3": (WILDCARD,),
-                "case4": (WILDCARD,),
-                "case5": (WILDCARD,),
-                "case6": (WILDCARD,),
-                "case7": (WILDCARD,),
-                "case8": (WILDCARD,),
-                "case9": (WILDCARD,),
-                "default": (WILDCARD,),
+            "optional": _OptionalCases({
+                "case0": (WILDCARD, {"lazy": True}),
+                "case1": (WILDCARD, {"lazy": True}),
+                "case2": (WILDCARD, {"lazy": True}),
+                "case3": (WILDCARD, {"lazy": True}),
+                "case4": (WILDCARD, {"lazy": True}),
+                "case5": (WILDCARD, {"lazy": True}),
+                "case6": (WILDCARD, {"lazy": True}),
+                "case7": (WILDCARD, {"lazy": True}),
+                "case8": (WILDCARD, {"lazy": True}),
+                "case9": (WILDCARD, {"lazy": True}),
+                "default": (WILDCARD, {"lazy": True}),
+                "indices": (WILDCARD,),
+                "key": ("STRING", {"default": ""}),
+                "keys": ("STRING", {"default": "", "multiline": True}),
+                "ways": ("INT", {"default": 10, "min": 1, "max": _MAX_WAYS, "step": 1}),
+            }),
+            "hidden": {
+                "prompt": "PROMPT",
+                "unique_id": "UNIQUE_ID",
             },
         }
 
-    @staticmethod
-    def _first_connected(cases: list[Optional[Any]]) -> tuple[Optional[Any], Optional[str]]:
-        for i, v in enumerate(cases):
-            if v is not None:
-                return v, f"case{i}"
-        return None, None
+    @classmethod
+    def _resolve(cls, idx: int, on_miss: str, present: Callable[[str], bool], cases: tuple = _CASES) -> str:
+        """Name of the input to use (caseN or default); same rules for lazy status and switch."""
+        connected = [name for name in cases if present(name)]
+        if on_miss == "auto":
+            if len(connected) == 1:
+                return connected[0]
+            if 0 <= idx < len(cases) and present(cases[idx]):
+                return cases[idx]
+            if not connected and present("default"):
+                return "default"
+            live = ", ".join(connected) or "none"
+            raise ValueError(f"[Switch_AS] auto needs exactly one unblocked case, found: {live}.")
+
+        # direct selection
+        if 0 <= idx < len(cases) and present(cases[idx]):
+            return cases[idx]
+
+        if on_miss == "use_default":
+            if present("default"):
+                return "default"
+            if connected:
+                return connected[0]
+            raise ValueError("[Switch_AS] selected case missing and no default/connected case provided.")
+        if on_miss in ("first_connected", "last_connected"):
+            if connected:
+                return connected[0] if on_miss == "first_connected" else connected[-1]
+            if present("default"):
+                return "default"
+            raise ValueError("[Switch_AS] no connected branches to choose from.")
+        # error
+        raise ValueError("[Switch_AS] selected case is missing (on_miss=error).")
+
+    def check_lazy_status(
+        self,
+        index: int,
+        on_miss: str,
+        indices=None,
+        key="",
+        keys="",
+        ways=10,
+        prompt=None,
+        unique_id=None,
+        **inputs,
+    ):
+        # linked inputs are always passed (None until evaluated); unlinked ones are absent
+        if indices is not None:
+            wanted = _index_values(indices, keys)[1]
+        else:
+            wanted = [_select_slot(index, key, keys)]
+        cases = _case_names(ways, inputs)
+        blocked = _blocked_inputs(prompt, unique_id)
+
+        def present(name: str) -> bool:
+            return name in inputs and name not in blocked and not _is_blocked(inputs[name])
+
+        try:
+            names = {self._resolve(k, on_miss, present, cases) for k in wanted}
+        except ValueError:
+            return []  # switch() reports the error
+        return [name for name in sorted(names) if inputs[name] is None]
 
     @staticmethod
-    def _last_connected(cases: list[Optional[Any]]) -> tuple[Optional[Any], Optional[str]]:
-        for i in range(len(cases) - 1, -1, -1):
-            if cases[i] is not None:
-                return cases[i], f"case{i}"
-        return None, None
+    def _present(values: Dict[str, Any]) -> Callable[[str], bool]:
+        # unrequested lazy cases arrive as None, so "present" means evaluated, not None and not blocked
+        return lambda name: values.get(name) is not None and not _is_blocked(values[name])
+
+    def _gather(self, indices: Any, on_miss: str, values: Dict[str, Any], keys: str, cases: tuple) -> Tuple[Any, str]:
+        flat, wanted = _index_values(indices, keys)
+        names = {k: self._resolve(k, on_miss, self._present(values), cases) for k in wanted}
+        sources = {k: values[name] for k, name in names.items()}
+        if not sources:
+            return [], "gather: 0 items"
+        first = next(iter(sources.values()))
+
+        latent = isinstance(first, dict) and "samples" in first
+        if latent or _is_tensor(first):
+            tensors = {k: (v["samples"] if isinstance(v, dict) else v) for k, v in sources.items()}
+            if not all(_is_tensor(t) for t in tensors.values()):
+                raise ValueError("[Switch_AS] gather mixes tensor and non-tensor cases.")
+            out = _gather_tensors(flat, tensors)
+            if latent:
+                out = {**{k: v for k, v in first.items() if k not in ("samples", "noise_mask", "batch_index")},
+                       "samples": out}
+            n = out["samples"].shape[0] if latent else out.shape[0]
+        else:
+            flat = flat.tolist() if _is_tensor(flat) else flat
+            out = []
+            for i, k in enumerate(flat):
+                v = sources[k]
+                out.append(v[i if len(v) > 1 else 0] if isinstance(v, (list, tuple)) else v)
+            n = len(out)
+
+        used = ", ".join(f"{k}->{name}" for k, name in names.items())
+        return out, f"gather: {n} items ({used})"
 
     def switch(
         self,
         index: int,
         on_miss: str,
-        case0=None,
-        case1=None,
-        case2=None,
-        case3=None,
-        case4=None,
-        case5=None,
-        case6=None,
-        case7=None,
-        case8=None,
-        case9=None,
         default=None,
+        indices=None,
+        key="",
+        keys="",
+        ways=10,
+        prompt=None,
+        unique_id=None,
+        **cases,
     ):
-        cases = [case0, case1, case2, case3, case4, case5, case6, case7, case8, case9]
-        idx = int(index)
+        values = dict(cases)
+        values["default"] = default
+        names = _case_names(ways, cases)
 
-        chosen = None
-        chosen_src = None
+        if indices is not None:
+            out, ui_text = self._gather(indices, on_miss, values, keys, names)
+            return {"ui": {"text": [ui_text]}, "result": (out,)}
 
-        # direct selection
-        if 0 <= idx < len(cases) and cases[idx] is not None:
-            chosen = cases[idx]
-            chosen_src = f"case{idx}"
-        else:
-            if on_miss == "use_default":
-                if default is not None:
-                    chosen, chosen_src = default, "default"
-                else:
-                    chosen, chosen_src = self._first_connected(cases)
-                    if chosen is None:
-                        raise ValueError("[Switch_AS] selected case missing and no default/connected case provided.")
-            elif on_miss == "first_connected":
-                chosen, chosen_src = self._first_connected(cases)
-                if chosen is None and default is not None:
-                    chosen, chosen_src = default, "default"
-                if chosen is None:
-                    raise ValueError("[Switch_AS] no connected branches to choose from.")
-            elif on_miss == "last_connected":
-                chosen, chosen_src = self._last_connected(cases)
-                if chosen is None and default is not None:
-                    chosen, chosen_src = default, "default"
-                if chosen is None:
-                    raise ValueError("[Switch_AS] no connected branches to choose from.")
-            else:  # error
-                raise ValueError("[Switch_AS] selected case is missing (on_miss=error).")
-
-        ui_text = f"index: {idx}\nselected: {chosen_src}"
+        idx = _select_slot(index, key, keys)
+        chosen_src = self._resolve(idx, on_miss, self._present(values), names)
+        chosen = values[chosen_src]
+
+        ui_text = f"index: {idx}" + (f" (key {key!r})" if isinstance(key, str) and key.strip() else "")
+        ui_text += f"\nselected: {chosen_src}"
         return {"ui": {"text": [ui_text]}, "result": (chosen,)}
 
 
@@ -1,7 +1,11 @@
 # file: transforms_agavesunset.py
 from __future__ import annotations
 
-from typing import Any, Tuple, List
+import re
+from array import array
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
 
 
 class AnyType(str):
@@ -13,6 +17,281 @@ class AnyType(str):
 
 WILDCARD = AnyType("*")
 
+_STRING_LIMIT = 4096
+_PREVIEW_ITEMS = 8
+_PREVIEW_CHARS = 200
+_SCALARS = (bool, int, float, str, type(None))
+
+
+def _is_array(v: Any) -> bool:
+    # torch tensors / numpy arrays, detected without importing either
+    return type(v).__module__.partition(".")[0] in ("torch", "numpy") and hasattr(v, "shape") and hasattr(v, "dtype")
+
+
+def _array_head(v: Any, n: int) -> list:
+    # only the first n elements are copied/synced to the host
+    flat = v.reshape(-1)
+    return flat[: min(n, flat.shape[0])].tolist()
+
+
+def _take(it, n: int = _PREVIEW_ITEMS) -> list:
+    out = []
+    for x in it:
+        if len(out) >= n:
+            break
+        out.append(x)
+    return out
+
+
+def _preview(v: Any, depth: int = 0) -> str:
+    """Fixed-cost summary: type, shape/len, dtype and the first few elements; never formats the whole object."""
+    if isinstance(v, str):
+        if len(v) <= _PREVIEW_CHARS:
+            return repr(v)
+        return f"{v[:_PREVIEW_CHARS]!r}... (len {len(v)})"
+    if isinstance(v, _SCALARS):
+        return repr(v)
+    if _is_array(v):
+        device = f", device={v.device}" if hasattr(v, "device") else ""
+        head = ", ".join(repr(x) for x in _array_head(v, _PREVIEW_ITEMS))
+        more = ", ..." if v.reshape(-1).shape[0] > _PREVIEW_ITEMS else ""
+        return f"{type(v).__name__}(shape={tuple(v.shape)}, dtype={v.dtype}{device}) [{head}{more}]"
+    if isinstance(v, (list, tuple, dict, set, frozenset)):
+        name = type(v).__name__
+        if depth >= 2:
+            return f"<{name} len={len(v)}>"
+        if isinstance(v, dict):
+            items = [f"{_preview(k, depth + 1)}: {_preview(x, depth + 1)}" for k, x in _take(v.items())]
+        else:
+            items = [_preview(x, depth + 1) for x in _take(v)]
+        more = ", ..." if len(v) > _PREVIEW_ITEMS else ""
+        return f"{name}(len={len(v)}) [{', '.join(items)}{more}]"
+    return f"<{type(v).__module__}.{type(v).__name__}>"
+
+
+def _bounded_str(v: Any, limit: int = _STRING_LIMIT) -> str:
+    """str(v) cut to limit chars, built incrementally so big containers are never fully formatted."""
+    if isinstance(v, str):
+        return v
+    if _is_array(v):
+        return _preview(v)
+    if isinstance(v, (list, tuple, dict)):
+        if isinstance(v, dict):
+            open_, close, parts = "{", "}", (f"{_bounded_str_item(k)}: {_bounded_str_item(x)}" for k, x in v.items())
+        else:
+            open_, close = ("[", "]") if isinstance(v, list) else ("(", ")")
+            parts = (_bounded_str_item(x) for x in v)
+        out = [open_]
+        size = 1
+        for i, part in enumerate(parts):
+            if i:
+                out.append(", ")
+                size += 2
+            out.append(part)
+            size += len(part)
+            if size > limit:
+                break
+        else:
+            if isinstance(v, tuple) and len(v) == 1:
+                out.append(",")
+            out.append(close)
+        return "".join(out)
+    return str(v)
+
+
+def _bounded_str_item(x: Any) -> str:
+    if isinstance(x, _SCALARS):
+        return repr(x)
+    return _bounded_str(x) if isinstance(x, (list, tuple, dict)) else _preview(x)
+
+
+# ---- text classifier ----
+# Precompiled once: translation table, patterns and vocabularies. _classify() normalizes
+# and parses a string a single time into all of its facets and is memoized, so the
+# AUTO pass and the INT/FLOAT/BOOLEAN conversions of the same text share one parse.
+
+_BOOL_TRUE = frozenset({"1", "true", "yes", "on", "t", "y", "是", "真", "开启", "开", "对", "赞成"})
+_BOOL_FALSE = frozenset({"0", "false", "no", "off", "f", "n", "", "否", "假", "关闭", "关", "错", "反对"})
+
+# full-width / typographic symbols -> ASCII (Unicode decimal digits are read natively by int/float)
+_DIGIT_TRANS = str.maketrans(
+    {
+        **{chr(0xFF10 + i): str(i) for i in range(10)},
+        "－": "-",
+        "−": "-",
+        "﹣": "-",
+        "＋": "+",
+        "﹢": "+",
+        "．": ".",
+        "，": ",",
+        "､": ",",
+        "ｅ": "e",
+        "Ｅ": "E",
+        "＿": "_",
+    }
+)
+
+_D = r"\d(?:_?\d)*"
+_INT_RE = re.compile(rf"[+-]?{_D}")
+_FLOAT_RE = re.compile(rf"[+-]?(?:{_D}\.?(?:{_D})?|\.{_D})(?:[eE][+-]?{_D})?|[+-]?(?:inf|infinity|nan)", re.I)
+
+_CN_DIGITS = {
+    "零": 0, "〇": 0, "一": 1, "壹": 1, "二": 2, "贰": 2, "貳": 2, "两": 2, "兩": 2, "三": 3, "叁": 3, "參": 3,
+    "四": 4, "肆": 4, "五": 5, "伍": 5, "六": 6, "陆": 6, "陸": 6, "七": 7, "柒": 7, "八": 8, "捌": 8,
+    "九": 9, "玖": 9,
+}
+_CN_UNITS = {"十": 10, "拾": 10, "百": 100, "佰": 100, "千": 1000, "仟": 1000}
+_CN_BIG = {"万": 10**4, "萬": 10**4, "亿": 10**8, "億": 10**8}
+_CN_SIGN = {"负": -1, "負": -1, "正": 1}
+_CN_POINT = ("点", "點")
+_CN_CHARS = frozenset(_CN_DIGITS) | frozenset(_CN_UNITS) | frozenset(_CN_BIG)
+
+
+def _cn_int(s: str) -> Optional[int]:
+    """
+    一百二十 -> 120, 两千零五 -> 2005, 一亿二千万 -> 120000000, 二〇二四 -> 2024.
+    Malformed numerals (万一, 千万, 十十, 一百二百, 一万二万) give None: units must strictly
+    decrease within a section, only a leading 十 may omit its digit, and 万/亿 need a section.
+    """
+    if not s or any(ch not in _CN_CHARS for ch in s):
+        return None
+    if all(ch in _CN_DIGITS for ch in s):
+        return int("".join(str(_CN_DIGITS[ch]) for ch in s))
+    total = section = 0
+    number = None  # pending digit
+    unit_cap = big_cap = float("inf")  # next unit / big unit must be below these
+    for i, ch in enumerate(s):
+        if ch in _CN_DIGITS:
+            if number:
+                return None  # 二三百
+            number = _CN_DIGITS[ch]
+        elif ch in _CN_UNITS:
+            unit = _CN_UNITS[ch]
+            if unit >= unit_cap or number == 0 or (number is None and not (i == 0 and unit == 10)):
+                return None
+            section += (number or 1) * unit
+            number = None
+            unit_cap = unit
+        else:
+            big = _CN_BIG[ch]
+            section += number or 0
+            if big == 10**8:
+                # 一万亿: a whole 万 group may be scaled by 亿, but only once
+                if total >= big or not (section or (i and s[i - 1] in _CN_BIG)):
+                    return None
+                total = (total + section) * big
+            else:
+                if big_cap <= big or not section:
+                    return None
+                total += section * big
+            section = 0
+            number = None
+            unit_cap = float("inf")
+            big_cap = big
+    return total + section + (number or 0)
+
+
+def _cn_number(s: str):
+    """Chinese numeral -> int / float, or None."""
+    sign = 1
+    if s[:1] in _CN_SIGN:
+        sign, s = _CN_SIGN[s[0]], s[1:]
+    for point in _CN_POINT:
+        if point in s:
+            whole, _, frac = s.partition(point)
+            head = _cn_int(whole) if whole else 0
+            if head is None or not frac or any(ch not in _CN_DIGITS for ch in frac):
+                return None
+            return sign * float(f"{head}.{''.join(str(_CN_DIGITS[ch]) for ch in frac)}")
+    value = _cn_int(s)
+    return None if value is None else sign * value
+
+
+# text: normalized string; as_bool/as_int/as_float: parsed value or None; int_err/float_err: failure text
+_Parsed = namedtuple("_Parsed", ["text", "as_bool", "as_int", "as_float", "int_err", "float_err"])
+
+
+@lru_cache(maxsize=2048)
+def _classify(text: str) -> _Parsed:
+    txt = text.translate(_DIGIT_TRANS).strip()
+    low = txt.lower()
+    as_bool = True if low in _BOOL_TRUE else (False if low in _BOOL_FALSE else None)
+
+    num = txt.replace(",", "")
+    as_int = as_float = None
+    int_err = f"invalid literal for int() with base 10: {num!r}"
+    float_err = f"could not convert string to float: {num!r}"
+    if _INT_RE.fullmatch(num):
+        try:
+            as_int = int(num)
+        except ValueError as e:  # int digit-count limit; float() still reads it
+            int_err = str(e)
+        as_float = float(num)
+    elif _FLOAT_RE.fullmatch(num):
+        as_float = float(num)
+    elif num:
+        cn = _cn_number(num)
+        if isinstance(cn, int):
+            as_int, as_float = cn, float(cn)
+        elif cn is not None:
+            as_float = cn
+    return _Parsed(txt, as_bool, as_int, as_float, int_err, float_err)
+
+
+# ---- batch conversion ----
+# Arrays are cast as a whole with the array's own dtype machinery (on the tensor's device);
+# only STRING and mixed object lists go element by element.
+
+_BATCH_WARN_EXAMPLES = 3
+
+
+def _is_batch(v: Any) -> bool:
+    return isinstance(v, (list, tuple)) or (_is_array(v) and len(v.shape) > 0)
+
+
+def _array_cast(v: Any, kind: str) -> Tuple[Any, Optional[str]]:
+    """Vectorized cast of a torch tensor / NumPy array; returns (array, warning)."""
+    torch_like = type(v).__module__.partition(".")[0] == "torch"
+    if torch_like:
+        import torch
+
+        is_bool, is_float = v.dtype == torch.bool, v.is_floating_point()
+        int_t, float_t = torch.int64, (v.dtype if is_float else torch.float32)
+    else:
+        import numpy
+
+        if v.dtype.kind not in "biuf":
+            return None, f"dtype {v.dtype} is not numeric"
+        is_bool, is_float = v.dtype.kind == "b", v.dtype.kind == "f"
+        int_t, float_t = numpy.int64, (v.dtype if is_float else numpy.float64)
+
+    if kind == "BOOLEAN":
+        return (v if is_bool else v != 0), None
+    if kind == "FLOAT":
+        return (v if is_float else (v.to(float_t) if torch_like else v.astype(float_t))), None
+
+    # INT: truncate toward zero like int(); NaN/inf have no integer value -> 0, counted once
+    warn = None
+    if is_float:
+        finite = torch.isfinite(v) if torch_like else numpy.isfinite(v)
+        bad = int((~finite).sum().item())
+        if bad:
+            warn = f"INT fallback 0 for {bad} non-finite element(s)"
+            v = v.where(finite, v.new_zeros(())) if torch_like else numpy.where(finite, v, 0)
+    if is_bool or v.dtype != int_t:
+        v = v.to(int_t) if torch_like else v.astype(int_t)
+    return v, warn
+
+
+def _aggregate_warnings(label: str, warns: List[Optional[str]], total: int) -> List[str]:
+    """One line per output instead of one per element: count plus the first few distinct messages."""
+    hits = [w for w in warns if w]
+    if not hits:
+        return []
+    examples = list(OrderedDict.fromkeys(hits))[:_BATCH_WARN_EXAMPLES]
+    more = "; ..." if len(set(hits)) > len(examples) else ""
+    return [f"{label}: {len(hits)} of {total} element(s) fell back: " + "; ".join(examples) + more]
+
 
 class Transforms_AS:
     """
@@ -25,6 +304,9 @@ class Transforms_AS:
         parse_hint: AUTO/INT/FLOAT/BOOLEAN/STRING (how to parse value_text when value is not connected)
     - Outputs:
         passthrough(*), INT, FLOAT, BOOLEAN, STRING
+    - Previews and as_string are fixed-cost summaries, never a full repr of large values.
+    - batch: a list/tuple/ndarray/tensor value is converted element by element; arrays are
+      cast as a whole (on device), outputs keep the container kind, warnings are aggregated.
     - Never raises: shows warnings in ui.text when parsing/conversion falls back.
     """
 
@@ -34,8 +316,8 @@ class Transforms_AS:
     RETURN_TYPES = (WILDCARD, "INT", "FLOAT", "BOOLEAN", "STRING")
     RETURN_NAMES = ("passthrough", "as_int", "as_float", "as_bool", "as_string")
 
-    _BOOL_TRUE = {"1", "true", "yes", "on", "t", "y", "是", "真", "开启", "开", "对", "赞成"}
-    _BOOL_FALSE = {"0", "false", "no", "off", "f", "n", "", "否", "假", "关闭", "关", "错", "反对"}
+    _BOOL_TRUE = _BOOL_TRUE
+    _BOOL_FALSE = _BOOL_FALSE
 
     @classmethod
     def INPUT_TYPES(cls):
@@ -46,14 +328,14 @@ class Transforms_AS:
             "optional": {
                 "value": (WILDCARD,),
                 "value_text": ("STRING", {"default": "", "multiline": False}),
+                "batch": ("BOOLEAN", {"default": False}),
             },
         }
 
     @staticmethod
     def _normalize_digits(s: str) -> str:
         # full-width digits/symbols -> half-width; trim spaces
-        trans = str.maketrans("０１２３４５６７８９－．，＋+", "0123456789-.,++")
-        return s.translate(trans).strip()
+        return s.translate(_DIGIT_TRANS).strip()
 
     def _parse_bool(self, raw: str) -> Tuple[bool, str | None]:
         low = raw.lower()
@@ -69,46 +351,33 @@ class Transforms_AS:
     def _from_text(self, text: str, hint: str) -> Tuple[Any, List[str]]:
         warns: List[str] = []
         raw = text
-        txt = self._normalize_digits(text)
+        if hint == "STRING":
+            return raw, warns
+        parsed = _classify(text)
 
         if hint == "BOOLEAN":
-            v, w = self._parse_bool(txt)
-            if w:
+            if parsed.as_bool is None:
+                _, w = self._parse_bool(parsed.text)
                 warns.append(w)
-            return v, warns
+                return False, warns
+            return parsed.as_bool, warns
 
         if hint == "INT":
-            try:
-                return int(txt.replace(",", "")), warns
-            except Exception as e:
-                warns.append(f"INT parse failed for {raw!r}: {e}; fallback 0")
+            if parsed.as_int is None:
+                warns.append(f"INT parse failed for {raw!r}: {parsed.int_err}; fallback 0")
                 return 0, warns
+            return parsed.as_int, warns
 
         if hint == "FLOAT":
-            try:
-                return float(txt.replace(",", "")), warns
-            except Exception as e:
-                warns.append(f"FLOAT parse failed for {raw!r}: {e}; fallback 0.0")
+            if parsed.as_float is None:
+                warns.append(f"FLOAT parse failed for {raw!r}: {parsed.float_err}; fallback 0.0")
                 return 0.0, warns
-
-        if hint == "STRING":
-            return raw, warns
+            return parsed.as_float, warns
 
         # AUTO: bool -> int -> float -> string
-        v_bool, w = self._parse_bool(txt)
-        if w is None:
-            return v_bool, warns
-
-        try:
-            return int(txt.replace(",", "")), warns
-        except Exception:
-            pass
-
-        try:
-            return float(txt.replace(",", "")), warns
-        except Exception:
-            pass
-
+        for v in (parsed.as_bool, parsed.as_int, parsed.as_float):
+            if v is not None:
+                return v, warns
         return raw, warns
 
     def _to_int(self, v: Any) -> Tuple[int, str | None]:
@@ -155,14 +424,54 @@ class Transforms_AS:
     @staticmethod
     def _to_string(v: Any) -> Tuple[str, str | None]:
         try:
-            s = str(v)
-            if len(s) > 4096:
-                s = s[:4093] + "..."
+            s = _bounded_str(v, _STRING_LIMIT)
+            if len(s) > _STRING_LIMIT:
+                s = s[: _STRING_LIMIT - 3] + "..."
             return s, None
         except Exception as e:
             return "", f"STRING conversion error: {e}; fallback ''"
 
-    def transform(self, parse_hint: str, value: Any = None, value_text: str = ""):
+    # output slot -> converter; slot 0 is the passthrough
+    _CONVERTERS = {1: "_to_int", 2: "_to_float", 3: "_to_bool", 4: "_to_string"}
+    _BATCH_KINDS = {1: (int, "INT"), 2: (float, "FLOAT"), 3: (bool, "BOOLEAN"), 4: (str, "STRING")}
+
+    def _convert_batch(self, slot: int, items: Any) -> Tuple[Any, List[str]]:
+        """Convert every element of items for one output slot; returns (container, aggregated warnings)."""
+        method = self._CONVERTERS[slot]
+        py_type, kind = self._BATCH_KINDS[slot]
+
+        if _is_array(items):
+            if kind != "STRING":
+                out, w = _array_cast(items, kind)
+                if out is not None:
+                    return out, ([f"{kind}: {w}"] if w else [])
+            items = items.tolist()  # STRING / non-numeric arrays need Python values
+            if not isinstance(items, list):
+                items = [items]
+
+        # homogeneous scalar lists take the plain builtin; everything else goes through the converter
+        if kind != "STRING" and all(type(x) in (bool, int, float) for x in items):
+            try:
+                out = [x != 0 for x in items] if py_type is bool else [py_type(x) for x in items]
+                return (tuple(out) if isinstance(items, tuple) else out), []
+            except (ValueError, OverflowError):
+                pass  # NaN/inf -> int; let the per-element path report it
+
+        convert = getattr(self, method)
+        out, warns = [], []
+        for x in items:
+            v, w = convert(x)
+            out.append(v)
+            warns.append(w)
+        return (tuple(out) if isinstance(items, tuple) else out), _aggregate_warnings(kind, warns, len(out))
+
+    def transform(
+        self,
+        parse_hint: str,
+        value: Any = None,
+        value_text: str = "",
+        batch: bool = False,
+    ):
         warns: List[str] = []
 
         if value is not None:
@@ -173,30 +482,29 @@ class Transforms_AS:
             src_desc = f"from text {value_text!r} -> {type(src).__name__}"
             warns.extend(w)
 
-        as_int, wi = self._to_int(src)
-        if wi:
-            warns.append(wi)
-
-        as_float, wf = self._to_float(src)
-        if wf:
-            warns.append(wf)
-
-        as_bool, wb = self._to_bool(src)
-        if wb:
-            warns.append(wb)
-
-        as_str, ws = self._to_string(src)
-        if ws:
-            warns.append(ws)
-
+        # every output is always computed: the output cache ignores downstream links
+        batched = bool(batch) and _is_batch(src)
+        converted: List[Any] = []
+        for slot in (1, 2, 3, 4):
+            if batched:
+                v, w = self._convert_batch(slot, src)
+                warns.extend(w)
+            else:
+                v, w = getattr(self, self._CONVERTERS[slot])(src)
+                if w:
+                    warns.append(w)
+            converted.append(v)
+        as_int, as_float, as_bool, as_str = converted
+
+        show = _preview if batched else str
         ui_lines = [
             "Transforms_input_AS",
             f"source: {src_desc}",
-            f"passthrough: {repr(src)}",
-            f"as_int: {as_int}",
-            f"as_float: {as_float}",
-            f"as_bool: {as_bool}",
-            f"as_string: {as_str!r}",
+            f"passthrough: {_preview(src)}",
+            f"as_int: {show(as_int)}",
+            f"as_float: {show(as_float)}",
+            f"as_bool: {show(as_bool)}",
+            f"as_string: {_preview(as_str)}",
         ]
         for w in warns:
             if w:
@@ -206,12 +514,177 @@ class Transforms_AS:
         return {"ui": {"text": [ui_text]}, "result": (src, as_int, as_float, as_bool, as_str)}
 
 
+# ---- bulk ingestion ----
+# Tokens are pulled from the text with a compiled pattern (no split() list) and appended
+# straight into a typed array buffer; the tensor output shares that buffer.
+
+_BULK_TOKENS = {
+    # whitespace / newline / comma / semicolon separated, JSON brackets and quotes ignored
+    "AUTO": re.compile(r"[^\s,;\[\]\"']+"),
+    "LINES": re.compile(r"[^\r\n]+"),
+}
+_BULK_TYPECODES = {"INT": "q", "FLOAT": "d", "BOOLEAN": "b"}
+_BULK_WARN_EXAMPLES = 5
+
+
+def _bulk_fallback(tok: str, dtype: str):
+    """Slow path for tokens int()/float() rejected: boolean vocabulary, thousands separators, Chinese numerals."""
+    parsed = _classify(tok)
+    if dtype == "BOOLEAN":
+        if parsed.as_bool is not None:
+            return parsed.as_bool
+        return None if parsed.as_float is None else parsed.as_float != 0
+    if parsed.as_bool is not None:
+        return int(parsed.as_bool)
+    if dtype == "INT":
+        return parsed.as_int
+    return parsed.as_int if parsed.as_int is not None else parsed.as_float
+
+
+def _buffer_to_tensor(buf: array):
+    """Zero-copy view of the buffer as a torch tensor, else a NumPy array, else the buffer itself."""
+    try:
+        import torch
+
+        dtype = {"q": torch.int64, "d": torch.float64, "b": torch.bool}[buf.typecode]
+        if not len(buf):
+            return torch.empty(0, dtype=dtype)
+        if buf.typecode == "b":
+            return torch.frombuffer(buf, dtype=torch.int8).bool()
+        return torch.frombuffer(buf, dtype=dtype)
+    except ImportError:
+        pass
+    try:
+        import numpy
+
+        return numpy.frombuffer(buf, dtype={"q": numpy.int64, "d": numpy.float64, "b": numpy.int8}[buf.typecode])
+    except ImportError:
+        return buf
+
+
+class TransformsBulk_AS:
+    """
+    Bulk numeric ingestion (Transforms_bulk_AS)
+
+    - Input: text (or a piped STRING on value): JSON arrays, delimited or one-per-line numbers
+    - format: AUTO (whitespace/comma/semicolon/JSON), LINES (one value per line), DELIMITED (custom delimiter)
+    - dtype: AUTO (int, upgraded to float on the first fractional value), INT, FLOAT, BOOLEAN
+    - Same full-width normalization and boolean vocabulary as Transforms_input_AS
+    - Outputs: items (OUTPUT_IS_LIST), tensor (one tensor / ndarray sharing the parsed buffer), count
+    - Never raises on bad tokens: they become 0 / False and are summarized in ui.text
+    """
+
+    CATEGORY = "AgaveSunset/AS"
+    FUNCTION = "ingest"
+
+    RETURN_TYPES = (WILDCARD, WILDCARD, "INT")
+    RETURN_NAMES = ("items", "tensor", "count")
+    OUTPUT_IS_LIST = (True, False, False)
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "text": ("STRING", {"default": "", "multiline": True}),
+                "format": (["AUTO", "LINES", "DELIMITED"], {"default": "AUTO"}),
+                "dtype": (["AUTO", "INT", "FLOAT", "BOOLEAN"], {"default": "AUTO"}),
+                "delimiter": ("STRING", {"default": ","}),
+            },
+            "optional": {
+                "value": (WILDCARD,),
+            },
+        }
+
+    @staticmethod
+    def _tokens(text: str, fmt: str, delimiter: str):
+        if fmt == "DELIMITED" and delimiter:
+            pattern = re.compile(f"(?:(?!{re.escape(delimiter)}).)+", re.S)
+        else:
+            pattern = _BULK_TOKENS.get(fmt, _BULK_TOKENS["AUTO"])
+        for m in pattern.finditer(text):
+            tok = m.group().strip()
+            if tok:
+                yield tok
+
+    def _parse(self, text: str, fmt: str, dtype: str, delimiter: str) -> Tuple[array, int, List[str]]:
+        buf = array(_BULK_TYPECODES.get(dtype, "q"))
+        append = buf.append
+        bad = 0
+        examples: List[str] = []
+        convert = {"INT": int, "FLOAT": float}.get(dtype)
+
+        for tok in self._tokens(text.translate(_DIGIT_TRANS), fmt, delimiter):
+            v = None
+            if dtype == "AUTO":
+                try:
+                    v = int(tok)
+                except ValueError:
+                    try:
+                        v = float(tok)
+                    except ValueError:
+                        pass
+            elif convert is not None:
+                try:
+                    v = convert(tok)
+                except ValueError:
+                    pass
+            if v is None:
+                v = _bulk_fallback(tok, dtype)
+            if v is None:
+                bad += 1
+                if len(examples) < _BULK_WARN_EXAMPLES:
+                    examples.append(tok)
+                v = False if dtype == "BOOLEAN" else 0
+            if dtype == "AUTO" and buf.typecode == "q" and isinstance(v, float):
+                buf = array("d", buf)  # one-time upgrade on the first fractional value
+                append = buf.append
+            try:
+                append(v)
+            except OverflowError:
+                bad += 1
+                if len(examples) < _BULK_WARN_EXAMPLES:
+                    examples.append(tok)
+                append(0)
+        return buf, bad, examples
+
+    def ingest(
+        self,
+        text: str,
+        format: str,
+        dtype: str,
+        delimiter: str = ",",
+        value: Any = None,
+    ):
+        if isinstance(value, str):
+            text = value
+        buf, bad, examples = self._parse(text or "", format, dtype, delimiter)
+
+        # both outputs are always built: the output cache ignores downstream links
+        items = buf.tolist()
+        if buf.typecode == "b":
+            items = [bool(x) for x in items]
+        tensor = _buffer_to_tensor(buf)
+
+        kind = {"q": "int64", "d": "float64", "b": "bool"}[buf.typecode]
+        ui_lines = [
+            "Transforms_bulk_AS",
+            f"parsed: {len(buf)} x {kind} ({format})",
+            f"head: {_preview(buf[:_PREVIEW_ITEMS].tolist())}",
+        ]
+        if bad:
+            shown = ", ".join(repr(x) for x in examples)
+            ui_lines.append(f"⚠ {bad} token(s) could not be parsed (fallback 0): {shown}{', ...' if bad > len(examples) else ''}")
+        return {"ui": {"text": ["\n".join(ui_lines)]}, "result": (items, tensor, len(buf))}
+
+
 # ---- registration (auto-scanned by __init__.py) ----
 NODE_CLASS_MAPPINGS = {
     # keep old node type key for backward compatibility
     "Transforms_input_AgaveSunset": Transforms_AS,
+    "TransformsBulkAgaveSunset": TransformsBulk_AS,
 }
 NODE_DISPLAY_NAME_MAPPINGS = {
     # unify display name suffix to _AS
     "Transforms_input_AgaveSunset": "Transforms_input_AS",
+    "TransformsBulkAgaveSunset": "Transforms_bulk_AS",
 }
@@ -0,0 +1,92 @@
+// file: web/extensions/agavesunset_dynamic_ports.js
+import { app } from "/scripts/app.js";
+
+// Switch_AS / Demux_AS: grow or shrink case/out ports to match the "ways" widget.
+// The backend accepts any caseN input and outN output, so only the UI needs to follow.
+const BASE_WAYS = 10;
+const FIXED_OUTPUTS = 12; // Demux_AS: out0..out9, selected_index, positions, out10, out11, ...
+
+const syncSwitchInputs = (node, ways) => {
+  const caseIndex = (inp) => {
+    const m = /^case(\d+)$/.exec(inp?.name ?? "");
+    return m ? Number(m[1]) : -1;
+  };
+
+  // add missing caseN (N >= 10), keeping them in order
+  const existing = new Set((node.inputs ?? []).map(caseIndex));
+  for (let n = BASE_WAYS; n < ways; n++) {
+    if (!existing.has(n)) node.addInput(`case${n}`, "*");
+  }
+
+  // drop unlinked extra cases above ways; linked ones stay so no link is lost
+  for (let i = (node.inputs?.length ?? 0) - 1; i >= 0; i--) {
+    const inp = node.inputs[i];
+    const n = caseIndex(inp);
+    if (n >= BASE_WAYS && n >= ways && inp.link == null) node.removeInput(i);
+  }
+};
+
+const syncDemuxOutputs = (node, ways) => {
+  const extra = () => (node.outputs?.length ?? 0) - FIXED_OUTPUTS;
+
+  // outputs are positional, so only append / remove from the end
+  while (extra() < ways - BASE_WAYS) {
+    node.addOutput(`out${BASE_WAYS + extra()}`, "*");
+  }
+  while (extra() > Math.max(ways - BASE_WAYS, 0)) {
+    const last = node.outputs[node.outputs.length - 1];
+    if (last.links?.length) break;
+    node.removeOutput(node.outputs.length - 1);
+  }
+};
+
+app.registerExtension({
+  name: "AgaveSunset.DynamicPorts",
+  beforeRegisterNodeDef(nodeType, nodeData, appInstance) {
+    // NOTE: keep matching the old node type keys for backward compatibility
+    const sync = {
+      SwitchAgaveSunset: syncSwitchInputs,
+      DemuxAgaveSunset: syncDemuxOutputs,
+    }[nodeData.name];
+    if (!sync) return;
+
+    const apply = (node) => {
+      const w = node.widgets?.find((w) => w.name === "ways");
+      if (!w) return;
+      sync(node, Math.max(1, Number(w.value) || BASE_WAYS));
+      requestAnimationFrame(() => {
+        node.setSize(node.computeSize());
+        appInstance.graph.setDirtyCanvas(true, true);
+      });
+    };
+
+    const hook = (node) => {
+      const w = node.widgets?.find((w) => w.name === "ways");
+      if (!w || w.__agavesunset_hooked__) return;
+      w.__agavesunset_hooked__ = true;
+      const callback = w.callback;
+      w.callback = function () {
+        const ret = callback?.apply(this, arguments);
+        apply(node);
+        return ret;
+      };
+    };
+
+    const onNodeCreated = nodeType.prototype.onNodeCreated;
+    nodeType.prototype.onNodeCreated = function () {
+      const ret = onNodeCreated?.apply(this, arguments);
+      hook(this);
+      apply(this);
+      return ret;
+    };
+
+    const onConfigure = nodeType.prototype.onConfigure;
+    nodeType.prototype.onConfigure = function () {
+      const ret = onConfigure?.apply(this, arguments);
+      // saved ports are restored by the graph; only add what a larger ways still needs
+      hook(this);
+      apply(this);
+      return ret;
+    };
+  },
+});
@@ -8,6 +8,13 @@ app.registerExtension({
     // NOTE: keep matching the old node type key for backward compatibility
     if (nodeData.name !== "Show_AgaveSunset") return;
 
+    // real inputs that are widgets (e.g. refresh) must survive; everything else is display
+    const declared = new Set([
+      ...Object.keys(nodeData.input?.required ?? {}),
+      ...Object.keys(nodeData.input?.optional ?? {}),
+    ]);
+    const REFRESH_OPTIONS = nodeData.input?.optional?.refresh?.[0] ?? [];
+
     const normalizeText = (msgText) => {
       if (msgText == null) return "";
 
@@ -35,8 +42,13 @@ app.registerExtension({
       let w = node.widgets?.find((w) => w.name === "__agavesunset_display__");
       if (!w) {
         if (Array.isArray(node.widgets)) {
-          for (const old of [...node.widgets]) old.onRemove?.();
+          const kept = [];
+          for (const old of node.widgets) {
+            if (declared.has(old.name)) kept.push(old);
+            else old.onRemove?.();
+          }
           node.widgets.length = 0;
+          node.widgets.push(...kept);
         }
 
         w = ComfyWidgets["STRING"](
@@ -88,7 +100,14 @@ app.registerExtension({
     nodeType.prototype.configure = function () {
       const cfg = arguments[0];
       const ret = configure?.apply(this, arguments);
-      const vals = cfg?.widgets_values;
+      let vals = cfg?.widgets_values;
+
+      // workflows saved before "refresh" existed put display text in its slot: restore the default
+      const refresh = this.widgets?.find((w) => w.name === "refresh");
+      if (refresh && !REFRESH_OPTIONS.includes(refresh.value)) {
+        refresh.value = REFRESH_OPTIONS[0] ?? "cached";
+      }
+      if (Array.isArray(vals) && REFRESH_OPTIONS.includes(vals[0])) vals = vals.slice(1);
 
       if (Array.isArray(vals) && vals.length > 0) {
         setText(this, vals);